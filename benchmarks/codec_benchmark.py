@@ -0,0 +1,70 @@
+"""
+Compares the JSON codecs available to the Metal clients on the request and
+response bodies of the endpoints that move the most data. No network
+calls are made, only encoding and decoding are timed.
+
+    $ python benchmarks/codec_benchmark.py
+"""
+import json
+import random
+import sys
+import timeit
+
+sys.path.insert(0, "src")
+
+from metal_sdk.encoding import CODECS  # noqa: E402
+
+DIMENSIONS = 1536
+
+
+def embedding():
+    return [random.uniform(-1, 1) for _ in range(DIMENSIONS)]
+
+
+def document(i):
+    return {
+        "id": f"doc-{i}",
+        "index": "index-id",
+        "text": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8,
+        "metadata": {"source": "benchmark", "position": i},
+    }
+
+
+ENDPOINTS = {
+    "POST /v1/index (embedding)": ("request", {"index": "index-id", "embedding": embedding()}),
+    "POST /v1/index/bulk (100 texts)": ("request", {"data": [document(i) for i in range(100)]}),
+    "POST /v1/index/bulk (100 embeddings)": (
+        "request",
+        {"data": [dict(document(i), embedding=embedding()) for i in range(100)]},
+    ),
+    "POST /v1/search (embedding)": ("request", {"index": "index-id", "embedding": embedding()}),
+    "POST /v1/search (100 hits)": ("response", {"data": [dict(document(i), dist=0.5) for i in range(100)]}),
+    "GET /v1/indexes/{index}/documents/{ids} (100 docs)": ("response", {"data": [document(i) for i in range(100)]}),
+}
+
+
+def bench(codec, direction, body, number):
+    if direction == "request":
+        return timeit.timeit(lambda: codec.dumps(body), number=number) / number
+    content = json.dumps(body).encode("utf-8")
+    return timeit.timeit(lambda: codec.loads(content), number=number) / number
+
+
+def main(number=50):
+    codecs = {}
+    for name, codec_class in CODECS.items():
+        try:
+            codecs[name] = codec_class()
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    for endpoint, (direction, body) in ENDPOINTS.items():
+        timings = {name: bench(codec, direction, body, number) for name, codec in codecs.items()}
+        baseline = timings["json"]
+        print(f"\n{endpoint} [{direction}]")
+        for name, elapsed in timings.items():
+            print(f"  {name:<8} {elapsed * 1e6:>10.1f} us  {baseline / elapsed:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import json
+import re
+from itertools import islice
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Union
+from .typings import BulkBatchResult, BulkDeleteReport, BulkIndexReport
+
+BULK_BATCH_SIZE = 100
+BULK_MAX_BYTES = 4 * 1024 * 1024
+BULK_MAX_WORKERS = 4
+BULK_DELETE_BATCH_SIZE = 1000
+BULK_RETRIES = 2
+BULK_RETRY_BACKOFF = 0.5
+GET_MANY_CHUNK_SIZE = 100
+# Budget for the comma-joined ids in a documents URL, well under the usual 8KiB request line limit
+GET_MANY_MAX_URL_IDS = 2000
+
+# Size of the {"data": [...]} envelope around a batch
+ENVELOPE_BYTES = len('{"data": []}')
+
+# Characters json.dumps escapes in an ASCII string
+JSON_ESCAPED = re.compile(r'["\\\x00-\x1f\x7f]')
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    if size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def id_chunks(ids: List[str], size=GET_MANY_CHUNK_SIZE, max_length=GET_MANY_MAX_URL_IDS) -> Iterator[List[str]]:
+    """
+    Split ids into chunks of at most size ids whose comma-joined length
+    stays within max_length. An id longer than max_length gets a chunk
+    of its own.
+    """
+    chunk = []
+    length = 0
+    for id in ids:
+        added = len(id) + (1 if chunk else 0)
+        if chunk and (len(chunk) >= size or length + added > max_length):
+            yield chunk
+            chunk = []
+            added = len(id)
+            length = 0
+        chunk.append(id)
+        length += added
+    if chunk:
+        yield chunk
+
+
+def estimate_size(value) -> int:
+    """
+    Estimate the length of json.dumps(value) without building the string.
+    """
+    if isinstance(value, str):
+        if value.isascii() and not JSON_ESCAPED.search(value):
+            return len(value) + 2
+        return len(json.dumps(value))
+    if value is None or isinstance(value, bool):
+        return 4 if value is None or value else 5
+    if isinstance(value, (int, float)):
+        return len(repr(value))
+    if isinstance(value, dict):
+        if not value:
+            return 2
+        size = sum(estimate_size(str(k)) + estimate_size(v) for k, v in value.items())
+        # ": " after every key and ", " between entries
+        return size + 2 + 2 * len(value) + 2 * (len(value) - 1)
+    if isinstance(value, (list, tuple)):
+        if not value:
+            return 2
+        return sum(estimate_size(v) for v in value) + 2 + 2 * (len(value) - 1)
+    return len(json.dumps(value))
+
+
+class Batcher:
+    """
+    Accumulates items and hands back a full batch once adding the next
+    item would exceed max_items or max_bytes.
+    """
+
+    def __init__(self, max_items: int, max_bytes: Optional[int] = None):
+        if max_items < 1:
+            raise ValueError("batch_size must be at least 1")
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.batch = []
+        self.batch_bytes = ENVELOPE_BYTES
+
+    def add(self, item) -> Optional[List]:
+        full = None
+        if self.max_bytes is None:
+            if len(self.batch) >= self.max_items:
+                full = self.flush()
+            self.batch.append(item)
+            return full
+
+        item_bytes = estimate_size(item)
+        separator = 2 if self.batch else 0
+        if self.batch and (
+            len(self.batch) >= self.max_items
+            or self.batch_bytes + separator + item_bytes > self.max_bytes
+        ):
+            full = self.flush()
+            separator = 0
+
+        # An item larger than max_bytes still goes out, alone in its batch
+        self.batch.append(item)
+        self.batch_bytes += separator + item_bytes
+        return full
+
+    def flush(self) -> Optional[List]:
+        batch = self.batch or None
+        self.batch = []
+        self.batch_bytes = ENVELOPE_BYTES
+        return batch
+
+
+def batched(items: Iterable, max_items: int, max_bytes: Optional[int] = None) -> Iterator[List]:
+    if max_bytes is None:
+        yield from chunked(items, max_items)
+        return
+
+    batcher = Batcher(max_items, max_bytes)
+    for item in items:
+        batch = batcher.add(item)
+        if batch is not None:
+            yield batch
+
+    batch = batcher.flush()
+    if batch is not None:
+        yield batch
+
+
+async def aiter_of(items: Iterable) -> AsyncIterator:
+    for item in items:
+        yield item
+
+
+async def askip(items: Union[Iterable, AsyncIterable], count: int) -> AsyncIterator:
+    if not hasattr(items, "__aiter__"):
+        items = aiter_of(islice(items, count, None))
+        count = 0
+
+    async for item in items:
+        if count > 0:
+            count -= 1
+            continue
+        yield item
+
+
+async def abatched(items: AsyncIterable, max_items: int, max_bytes: Optional[int] = None) -> AsyncIterator[List]:
+    batcher = Batcher(max_items, max_bytes)
+    async for item in items:
+        batch = batcher.add(item)
+        if batch is not None:
+            yield batch
+
+    batch = batcher.flush()
+    if batch is not None:
+        yield batch
+
+
+def new_report() -> BulkIndexReport:
+    return {"batches": 0, "indexed": 0, "failed": 0, "skipped": 0, "results": []}
+
+
+def batch_result(batch: int, count: int, response=None, error: Optional[str] = None, skipped=0) -> BulkBatchResult:
+    result = {"batch": batch, "count": count}
+    if skipped:
+        result["skipped"] = skipped
+    if error is not None:
+        result["error"] = error
+    else:
+        result["response"] = response
+    return result
+
+
+def record(report: BulkIndexReport, result: BulkBatchResult):
+    report["batches"] += 1
+    report["skipped"] += result.get("skipped", 0)
+    if result.get("error") is not None:
+        report["failed"] += result["count"]
+    else:
+        report["indexed"] += result["count"]
+    report["results"].append(result)
+
+
+def finish(report: BulkIndexReport) -> BulkIndexReport:
+    report["results"].sort(key=lambda result: result["batch"])
+    return report
+
+
+def new_delete_report() -> BulkDeleteReport:
+    return {"batches": 0, "deleted": [], "failed": [], "failures": []}
+
+
+def record_delete(report: BulkDeleteReport, ids: List[str], error: Optional[str] = None):
+    report["batches"] += 1
+    if error is not None:
+        report["failed"].extend(ids)
+        report["failures"].append({"ids": ids, "error": error})
+    else:
+        report["deleted"].extend(ids)
@@ -0,0 +1,208 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+from .typings import CacheStats
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CACHE_MAXSIZE = 1024
+CACHE_TTL = 60.0
+SEMANTIC_THRESHOLD = 0.99
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire ttl seconds after
+    they were stored. Cached values are returned as-is, not copied.
+    """
+
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttl=CACHE_TTL, clock: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, object]:
+        with self.__lock:
+            entry = self.__entries.get(key, MISSING)
+            if entry is not MISSING and entry[0] <= self.clock():
+                del self.__entries[key]
+                entry = MISSING
+
+            if entry is MISSING:
+                self.__misses += 1
+                return False, None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value):
+        with self.__lock:
+            self.__entries[key] = (self.clock() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def delete(self, key: Hashable):
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        with self.__lock:
+            for key in [key for key in self.__entries if predicate(key)]:
+                del self.__entries[key]
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_rate": self.__hits / lookups if lookups else 0.0,
+                "evictions": self.__evictions,
+                "size": len(self.__entries),
+            }
+
+
+class SemanticCache:
+    """
+    Cache of embedding search results that also answers queries whose
+    embedding is within threshold cosine similarity of a cached one. Query
+    vectors live in one preallocated float32 matrix so a lookup is a
+    single matrix-vector product. Requires numpy.
+    """
+
+    def __init__(
+        self,
+        threshold=SEMANTIC_THRESHOLD,
+        maxsize=CACHE_MAXSIZE,
+        ttl=CACHE_TTL,
+        max_bytes: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if numpy is None:
+            raise ImportError("numpy is required for SemanticCache")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__vectors = None
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __allocate(self, dimensions: int):
+        rows = self.maxsize
+        if self.max_bytes is not None:
+            rows = max(1, min(rows, self.max_bytes // (dimensions * 4)))
+        self.__vectors = numpy.zeros((rows, dimensions), dtype=numpy.float32)
+        self.__expires = numpy.full(rows, -numpy.inf)
+        self.__used = numpy.zeros(rows)
+        self.__scopes = [None] * rows
+        self.__values = [None] * rows
+
+    def __normalize(self, embedding) -> Optional["numpy.ndarray"]:
+        vector = numpy.asarray(embedding, dtype=numpy.float32).ravel()
+        norm = numpy.linalg.norm(vector)
+        if norm == 0 or (self.__vectors is not None and vector.shape[0] != self.__vectors.shape[1]):
+            return None
+        return vector / norm
+
+    def get(self, scope: Hashable, embedding) -> Tuple[bool, object]:
+        with self.__lock:
+            vector = None if self.__vectors is None else self.__normalize(embedding)
+            if vector is not None:
+                now = self.clock()
+                similarities = self.__vectors @ vector
+                live = self.__expires > now
+                candidates = numpy.flatnonzero(live & (similarities >= self.threshold))
+                for row in candidates[numpy.argsort(-similarities[candidates])]:
+                    if self.__scopes[row] == scope:
+                        self.__used[row] = now
+                        self.__hits += 1
+                        return True, self.__values[row]
+
+            self.__misses += 1
+            return False, None
+
+    def set(self, scope: Hashable, embedding, value):
+        with self.__lock:
+            if self.__vectors is None:
+                self.__allocate(numpy.asarray(embedding).size)
+            vector = self.__normalize(embedding)
+            if vector is None:
+                return
+
+            now = self.clock()
+            free = numpy.flatnonzero(self.__expires <= now)
+            if free.size:
+                row = free[0]
+            else:
+                # Every row is live, replace the least recently used one
+                row = int(numpy.argmin(self.__used))
+                self.__evictions += 1
+
+            self.__vectors[row] = vector
+            self.__expires[row] = now + self.ttl
+            self.__used[row] = now
+            self.__scopes[row] = scope
+            self.__values[row] = value
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]):
+        with self.__lock:
+            if self.__vectors is None:
+                return
+            for row, scope in enumerate(self.__scopes):
+                if scope is not None and predicate(scope):
+                    self.__expires[row] = -numpy.inf
+                    self.__scopes[row] = None
+                    self.__values[row] = None
+
+    def clear(self):
+        with self.__lock:
+            self.__vectors = None
+
+    def __len__(self):
+        if self.__vectors is None:
+            return 0
+        return int(numpy.count_nonzero(self.__expires > self.clock()))
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.__vectors is None else self.__vectors.nbytes
+
+    def stats(self) -> CacheStats:
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "hit_rate": self.__hits / lookups if lookups else 0.0,
+                "evictions": self.__evictions,
+                "size": len(self),
+            }
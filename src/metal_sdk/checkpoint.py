@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from .typings import BulkBatchResult, CheckpointState
+
+CHECKPOINT_INTERVAL = 5.0
+
+
+class Checkpoint:
+    """
+    Progress of an index_many job over an ordered source, saved to a JSON
+    file. offset only moves past batches that were sent along with every
+    batch before them, and stops at the first failed batch, so a resumed
+    job never skips an item that did not make it. failures lists the
+    failed batches of the last run, which a resumed job sends again.
+    """
+
+    def __init__(self, path: str, interval=CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.__lock = threading.Lock()
+        self.__saved_at = time.monotonic()
+        self.state: CheckpointState = {"offset": 0, "batches": 0, "failed": 0, "failures": []}
+
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        self.start()
+
+    @property
+    def offset(self) -> int:
+        return self.state["offset"]
+
+    def start(self) -> int:
+        """
+        Begin a run from offset and return it. Failures of an earlier run
+        all lie past offset and are sent again, so they are cleared.
+        """
+        with self.__lock:
+            self.__next = self.state["offset"]
+            self.__failed = False
+            self.__completed = {}
+            self.state["failed"] = 0
+            self.state["failures"] = []
+            return self.state["offset"]
+
+    def complete(self, start: int, result: BulkBatchResult):
+        with self.__lock:
+            self.__completed[start] = result
+            while self.__next in self.__completed:
+                done = self.__completed.pop(self.__next)
+                if done.get("error") is not None:
+                    self.__failed = True
+                    self.state["failed"] += done["count"]
+                    self.state["failures"].append({"offset": self.__next, "count": done["count"], "error": done["error"]})
+                # Items skipped as unchanged were consumed from the source as well
+                self.__next += done["count"] + done.get("skipped", 0)
+                if not self.__failed:
+                    self.state["batches"] += 1
+                    self.state["offset"] = self.__next
+
+            if time.monotonic() - self.__saved_at >= self.interval:
+                self.__save()
+
+    def __save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.__saved_at = time.monotonic()
+
+    def save(self):
+        with self.__lock:
+            self.__save()
@@ -0,0 +1,168 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+import httpx
+from .typings import CircuitStats
+
+CIRCUIT_FAILURE_RATE = 0.5
+CIRCUIT_SLOW_RATE = 0.8
+CIRCUIT_WINDOW = 20
+CIRCUIT_MIN_CALLS = 10
+CIRCUIT_OPEN_DURATION = 30.0
+CIRCUIT_HALF_OPEN_CALLS = 3
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """
+    Raised instead of sending a request while the circuit for its endpoint
+    is open.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit for {endpoint} endpoints is open, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class Circuit:
+    def __init__(self):
+        self.state = CLOSED
+        self.outcomes = deque()
+        self.opened_at = 0.0
+        self.trials = 0
+        self.successes = 0
+        self.rejected = 0
+
+
+class CircuitBreaker:
+    """
+    One circuit per endpoint class. A closed circuit opens once at least
+    min_calls of the last window calls were made and failure_rate of them
+    failed, or slow_rate of them took longer than slow_call_duration
+    seconds. An open circuit rejects calls for open_duration seconds, then
+    goes half-open and lets half_open_calls trial calls through: one
+    failure opens it again, all of them succeeding closes it.
+    """
+
+    def __init__(
+        self,
+        failure_rate=CIRCUIT_FAILURE_RATE,
+        slow_call_duration: Optional[float] = None,
+        slow_rate=CIRCUIT_SLOW_RATE,
+        window=CIRCUIT_WINDOW,
+        min_calls=CIRCUIT_MIN_CALLS,
+        open_duration=CIRCUIT_OPEN_DURATION,
+        half_open_calls=CIRCUIT_HALF_OPEN_CALLS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if min_calls > window:
+            raise ValueError("min_calls can't be larger than window")
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_rate = slow_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__circuits = {}
+
+    def __circuit(self, endpoint: str) -> Circuit:
+        circuit = self.__circuits.get(endpoint)
+        if circuit is None:
+            circuit = self.__circuits[endpoint] = Circuit()
+        return circuit
+
+    def state(self, endpoint: str) -> str:
+        with self.__lock:
+            return self.__circuit(endpoint).state
+
+    def check(self, endpoint: str):
+        """
+        Let a call through or raise CircuitOpenError. Every call let through
+        must be followed by a record.
+        """
+        with self.__lock:
+            circuit = self.__circuit(endpoint)
+            now = self.clock()
+            if circuit.state == OPEN and now - circuit.opened_at >= self.open_duration:
+                circuit.state = HALF_OPEN
+                circuit.trials = 0
+                circuit.successes = 0
+
+            if circuit.state == OPEN:
+                circuit.rejected += 1
+                raise CircuitOpenError(endpoint, self.open_duration - (now - circuit.opened_at))
+            if circuit.state == HALF_OPEN:
+                if circuit.trials >= self.half_open_calls:
+                    circuit.rejected += 1
+                    raise CircuitOpenError(endpoint, 0.0)
+                circuit.trials += 1
+
+    def record(self, endpoint: str, latency: float, failed: bool):
+        with self.__lock:
+            circuit = self.__circuit(endpoint)
+            now = self.clock()
+            slow = self.slow_call_duration is not None and latency > self.slow_call_duration
+
+            if circuit.state == HALF_OPEN:
+                if failed or slow:
+                    self.__open(circuit, now)
+                    return
+                circuit.successes += 1
+                if circuit.successes >= self.half_open_calls:
+                    circuit.state = CLOSED
+                    circuit.outcomes.clear()
+                return
+
+            if circuit.state == OPEN:
+                # A call let through before the circuit opened
+                return
+
+            circuit.outcomes.append((failed, slow))
+            if len(circuit.outcomes) > self.window:
+                circuit.outcomes.popleft()
+            calls = len(circuit.outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for failure, _ in circuit.outcomes if failure)
+            slow_calls = sum(1 for _, slow_call in circuit.outcomes if slow_call)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_rate:
+                self.__open(circuit, now)
+
+    def cancel(self, endpoint: str):
+        """
+        Settle a call that was let through but cancelled before it had an
+        outcome, freeing its half-open trial.
+        """
+        with self.__lock:
+            circuit = self.__circuit(endpoint)
+            if circuit.state == HALF_OPEN and circuit.trials > 0:
+                circuit.trials -= 1
+
+    def __open(self, circuit: Circuit, now: float):
+        circuit.state = OPEN
+        circuit.opened_at = now
+        circuit.outcomes.clear()
+
+    def stats(self) -> Dict[str, CircuitStats]:
+        with self.__lock:
+            stats = {}
+            for endpoint, circuit in self.__circuits.items():
+                calls = len(circuit.outcomes)
+                failures = sum(1 for failure, _ in circuit.outcomes if failure)
+                slow_calls = sum(1 for _, slow_call in circuit.outcomes if slow_call)
+                stats[endpoint] = {
+                    "state": circuit.state,
+                    "calls": calls,
+                    "failure_rate": failures / calls if calls else 0.0,
+                    "slow_rate": slow_calls / calls if calls else 0.0,
+                    "rejected": circuit.rejected,
+                }
+            return stats
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, List
+
+COALESCE_WINDOW = 0.01
+
+
+def split_response(res, count: int) -> List:
+    """
+    Give every coalesced caller its own slice of a bulk response when the
+    server returned one entry per item, otherwise the whole response.
+    """
+    if isinstance(res, dict) and isinstance(res.get("data"), list) and len(res["data"]) == count:
+        return [dict(res, data=item) for item in res["data"]]
+    return [res] * count
+
+
+class IndexCoalescer:
+    """
+    Merges index items submitted from many threads into bulk requests. A
+    batch is sent once max_batch items are queued or window seconds after
+    its first item arrived, whichever comes first.
+    """
+
+    def __init__(self, send: Callable[[List], object], max_batch: int, window: float = COALESCE_WINDOW):
+        if max_batch < 1:
+            raise ValueError("coalesce_max_batch must be at least 1")
+        self.send = send
+        self.max_batch = max_batch
+        self.window = window
+        self.__lock = threading.Lock()
+        self.__items = []
+        self.__futures = []
+        self.__timer = None
+
+    def __take(self):
+        items, futures = self.__items, self.__futures
+        self.__items, self.__futures = [], []
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        return items, futures
+
+    def __dispatch(self, items, futures):
+        if not items:
+            return
+        try:
+            res = self.send(items)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, split_response(res, len(items))):
+            if not future.done():
+                future.set_result(result)
+
+    def submit(self, item) -> Future:
+        future = Future()
+        batch = None
+        with self.__lock:
+            self.__items.append(item)
+            self.__futures.append(future)
+            if len(self.__items) >= self.max_batch:
+                batch = self.__take()
+            elif self.__timer is None:
+                self.__timer = threading.Timer(self.window, self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+        if batch is not None:
+            # A full batch is sent from the submitting thread, which would block on it anyway
+            self.__dispatch(*batch)
+        return future
+
+    def flush(self):
+        with self.__lock:
+            batch = self.__take()
+        self.__dispatch(*batch)
+
+    def close(self):
+        self.flush()
+
+
+class AsyncIndexCoalescer:
+    """
+    Task-based counterpart of IndexCoalescer for the asyncio client.
+    """
+
+    def __init__(self, send: Callable[[List], object], max_batch: int, window: float = COALESCE_WINDOW):
+        if max_batch < 1:
+            raise ValueError("coalesce_max_batch must be at least 1")
+        self.send = send
+        self.max_batch = max_batch
+        self.window = window
+        self.__items = []
+        self.__futures = []
+        self.__timer = None
+        self.__tasks = set()
+
+    def __take(self):
+        items, futures = self.__items, self.__futures
+        self.__items, self.__futures = [], []
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        return items, futures
+
+    async def __dispatch(self, items, futures):
+        if not items:
+            return
+        try:
+            res = await self.send(items)
+        except BaseException as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for future, result in zip(futures, split_response(res, len(items))):
+            if not future.done():
+                future.set_result(result)
+
+    def __schedule(self):
+        task = asyncio.ensure_future(self.__dispatch(*self.__take()))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    def submit(self, item) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__items.append(item)
+        self.__futures.append(future)
+        if len(self.__items) >= self.max_batch:
+            self.__schedule()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.window, self.__schedule)
+        return future
+
+    async def flush(self):
+        await self.__dispatch(*self.__take())
+
+    async def close(self):
+        await self.flush()
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
@@ -0,0 +1,127 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Optional
+from .typings import ConcurrencyStats
+
+ADAPTIVE_INITIAL_LIMIT = 4
+ADAPTIVE_MIN_LIMIT = 1
+ADAPTIVE_MAX_LIMIT = 64
+ADAPTIVE_BACKOFF = 0.5
+ADAPTIVE_LATENCY_TOLERANCE = 2.0
+ADAPTIVE_SMOOTHING = 0.1
+
+
+class AdaptiveLimiter:
+    """
+    asyncio concurrency limit tuned by AIMD. A healthy response that came
+    back while every slot was taken grows the limit by 1/limit, about one
+    more slot per round trip, up to the caller's bound, and an
+    overloaded response (429, 5xx, a transport error, or a latency above
+    latency_tolerance times the smoothed healthy latency of its endpoint)
+    multiplies it by backoff. Latencies are smoothed per endpoint, so a
+    large bulk post is not judged against small reads. Only requests
+    started after the last cut can cut it again, so a burst of failures
+    already in flight counts as a single signal.
+    """
+
+    def __init__(
+        self,
+        initial_limit=ADAPTIVE_INITIAL_LIMIT,
+        min_limit=ADAPTIVE_MIN_LIMIT,
+        max_limit=ADAPTIVE_MAX_LIMIT,
+        backoff=ADAPTIVE_BACKOFF,
+        latency_tolerance=ADAPTIVE_LATENCY_TOLERANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.__limit = float(initial_limit)
+        self.__in_flight = 0
+        self.__waiters = deque()
+        self.__latencies = {}
+        self.__decreased_at = float("-inf")
+        self.__increases = 0
+        self.__decreases = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self.__limit)
+
+    async def acquire(self) -> float:
+        """
+        Wait for a free slot and return the start time to hand to release.
+        """
+        while self.__in_flight >= self.limit:
+            waiter = asyncio.get_event_loop().create_future()
+            self.__waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self.__waiters:
+                    self.__waiters.remove(waiter)
+                # A wakeup this task can no longer use goes to the next waiter
+                self.__wake()
+                raise
+        self.__in_flight += 1
+        return self.clock()
+
+    def release(self, started: float, overloaded=False, endpoint="default", bound: Optional[int] = None):
+        """
+        Free the slot of a finished request. bound is the concurrency the
+        caller allows at most, the limit never goes past it.
+        """
+        # A limit that was not the bottleneck learns nothing from a healthy response
+        saturated = self.__in_flight >= self.limit
+        self.__in_flight -= 1
+        ceiling = self.max_limit if bound is None else max(self.min_limit, min(self.max_limit, bound))
+        self.__limit = min(self.__limit, float(ceiling))
+        latency = self.clock() - started
+        smoothed = self.__latencies.get(endpoint)
+        spike = smoothed is not None and latency > self.latency_tolerance * smoothed
+
+        if overloaded or spike:
+            if started >= self.__decreased_at:
+                self.__limit = max(float(self.min_limit), self.__limit * self.backoff)
+                self.__decreased_at = self.clock()
+                self.__decreases += 1
+        else:
+            self.__latencies[endpoint] = latency if smoothed is None else (
+                ADAPTIVE_SMOOTHING * latency + (1 - ADAPTIVE_SMOOTHING) * smoothed
+            )
+            if saturated and self.__limit < ceiling:
+                self.__limit = min(float(ceiling), self.__limit + 1 / self.__limit)
+                self.__increases += 1
+        self.__wake()
+
+    def cancel(self):
+        """
+        Free the slot of a request cancelled before it had an outcome,
+        without adjusting the limit.
+        """
+        self.__in_flight -= 1
+        self.__wake()
+
+    def __wake(self):
+        free = self.limit - self.__in_flight
+        while free > 0 and self.__waiters:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def stats(self) -> ConcurrencyStats:
+        return {
+            "limit": self.limit,
+            "in_flight": self.__in_flight,
+            "waiting": len(self.__waiters),
+            "increases": self.__increases,
+            "decreases": self.__decreases,
+        }
@@ -0,0 +1,201 @@
+import json
+import struct
+import zlib
+from typing import List, Optional, Union
+from .typings import Embedding
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_THRESHOLD = 1024
+
+
+def float32_to_list(values) -> List[float]:
+    """
+    Turn float32 values into the floats whose repr is the shortest decimal
+    that reads back as the same float32, instead of the up to 17 digits
+    of their exact float64 value. That about halves the JSON size, at the
+    cost of more CPU than a plain tolist().
+    """
+    if numpy is not None:
+        # numpy's str of a float32 scalar is already the shortest round-tripping decimal
+        return [float(str(value)) for value in numpy.asarray(values)]
+    return [shortest_float32(value) for value in values]
+
+
+def shortest_float32(value: float) -> float:
+    for digits in range(6, 9):
+        shortest = float(f"{value:.{digits}g}")
+        if struct.unpack("f", struct.pack("f", shortest))[0] == value:
+            return shortest
+    return float(f"{value:.9g}")
+
+
+def embedding_to_list(embedding: Embedding, compact=False) -> List[float]:
+    """
+    Turn a list, NumPy array, array.array or memoryview of floats into the
+    list of floats the JSON body needs. Buffers are converted in one
+    C-level tolist() call instead of element by element. With compact,
+    float32 buffers go through float32_to_list for a smaller body.
+    """
+    if isinstance(embedding, list):
+        return embedding
+    if isinstance(embedding, memoryview) and embedding.format not in ("f", "d"):
+        raise TypeError("embedding memoryview must hold float32 or float64 values")
+    if getattr(embedding, "ndim", 1) != 1:
+        raise TypeError("embedding must be one-dimensional")
+    if compact and is_float32(embedding):
+        return float32_to_list(embedding)
+    if hasattr(embedding, "tolist"):
+        return embedding.tolist()
+    return [float(value) for value in embedding]
+
+
+def is_float32(embedding) -> bool:
+    dtype = getattr(embedding, "dtype", None)
+    if dtype is not None:
+        return dtype.kind == "f" and dtype.itemsize <= 4
+    return getattr(embedding, "format", getattr(embedding, "typecode", None)) == "f"
+
+
+def with_embedding_list(item: dict, compact=False) -> dict:
+    embedding = item.get("embedding")
+    if embedding is None or isinstance(embedding, list):
+        return item
+    return dict(item, embedding=embedding_to_list(embedding, compact))
+
+
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, data) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def loads(self, content: bytes):
+        return json.loads(content)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def dumps(self, data) -> bytes:
+        return orjson.dumps(data)
+
+    def loads(self, content: bytes):
+        return orjson.loads(content)
+
+
+class MsgspecCodec(JsonCodec):
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+        self.encoder = msgspec.json.Encoder()
+        self.decoder = msgspec.json.Decoder()
+
+    def dumps(self, data) -> bytes:
+        return self.encoder.encode(data)
+
+    def loads(self, content: bytes):
+        return self.decoder.decode(content)
+
+
+CODECS = {"json": JsonCodec, "orjson": OrjsonCodec, "msgspec": MsgspecCodec}
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> Optional[JsonCodec]:
+    """
+    None keeps httpx's own json handling. "auto" picks the fastest codec
+    installed, falling back to the stdlib json module.
+    """
+    if codec is None or isinstance(codec, JsonCodec):
+        return codec
+    if codec == "auto":
+        if orjson is not None:
+            return OrjsonCodec()
+        if msgspec is not None:
+            return MsgspecCodec()
+        return JsonCodec()
+    if codec not in CODECS:
+        raise ValueError(f"Unknown json codec: {codec}")
+    return CODECS[codec]()
+
+
+def encode_body(codec: Optional[JsonCodec], data) -> dict:
+    if codec is None or data is None:
+        return {"json": data}
+    return {"content": codec.dumps(data)}
+
+
+def decode_body(codec: Optional[JsonCodec], res):
+    if codec is None:
+        return res.json()
+    return codec.loads(res.content)
+
+
+class Compression:
+    """
+    Request body compression. Bodies smaller than threshold bytes are sent
+    as-is, and compression is switched off for the client if the server
+    rejects the Content-Encoding.
+    """
+
+    def __init__(self, encoding="gzip", threshold=COMPRESSION_THRESHOLD, level=None):
+        if encoding not in ("gzip", "zstd"):
+            raise ValueError(f"Unsupported compression: {encoding}")
+        if encoding == "zstd" and zstandard is None:
+            raise ImportError("zstandard is not installed")
+        self.encoding = encoding
+        self.threshold = threshold
+        self.enabled = True
+        if encoding == "gzip":
+            self.level = 6 if level is None else level
+        else:
+            self.level = 3 if level is None else level
+            self.__zstd = zstandard.ZstdCompressor(level=self.level)
+
+    def compress(self, body: bytes) -> bytes:
+        if self.encoding == "gzip":
+            # wbits=31 writes a gzip container without gzip.compress's timestamp
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+            return compressor.compress(body) + compressor.flush()
+        return self.__zstd.compress(body)
+
+
+def encode_request(codec: Optional[JsonCodec], compression: Optional[Compression], data, headers=None):
+    """
+    Build the body and headers keyword arguments of a request, returning
+    them along with whether the body was compressed.
+    """
+    body = encode_body(codec, data)
+    if compression is None or not compression.enabled or data is None:
+        return dict(body, headers=headers), False
+
+    content = body["content"] if "content" in body else json.dumps(data).encode("utf-8")
+    if len(content) < compression.threshold:
+        return {"content": content, "headers": headers}, False
+
+    headers = dict(headers or {}, **{"Content-Encoding": compression.encoding})
+    return {"content": compression.compress(content), "headers": headers}, True
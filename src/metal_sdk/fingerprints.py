@@ -0,0 +1,48 @@
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Iterable, List, Set, Tuple
+
+
+def fingerprint(data: dict) -> bytes:
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).digest()
+
+
+class FingerprintStore:
+    """
+    SQLite table of content hashes keyed by (index, document id), used to
+    skip documents whose indexed content has not changed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        with self.__db:
+            self.__db.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "idx TEXT NOT NULL, id TEXT NOT NULL, hash BLOB NOT NULL, PRIMARY KEY (idx, id))"
+            )
+
+    def changed(self, entries: List[Tuple[str, str, bytes]]) -> Set[Tuple[str, str]]:
+        changed = set()
+        with self.__lock:
+            for index, id, digest in entries:
+                row = self.__db.execute("SELECT hash FROM fingerprints WHERE idx = ? AND id = ?", (index, id)).fetchone()
+                if row is None or row[0] != digest:
+                    changed.add((index, id))
+        return changed
+
+    def put(self, entries: Iterable[Tuple[str, str, bytes]]):
+        with self.__lock, self.__db:
+            self.__db.executemany("INSERT OR REPLACE INTO fingerprints (idx, id, hash) VALUES (?, ?, ?)", entries)
+
+    def forget(self, index: str, ids: Iterable[str]):
+        with self.__lock, self.__db:
+            self.__db.executemany("DELETE FROM fingerprints WHERE idx = ? AND id = ?", [(index, id) for id in ids])
+
+    def close(self):
+        with self.__lock:
+            self.__db.close()
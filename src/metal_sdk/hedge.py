@@ -0,0 +1,77 @@
+import math
+import threading
+from collections import deque
+from .typings import HedgeStats
+
+HEDGE_PERCENTILE = 0.95
+HEDGE_BUDGET = 0.1
+HEDGE_WINDOW = 1000
+HEDGE_MIN_SAMPLES = 20
+HEDGE_INITIAL_DELAY = 0.1
+HEDGE_MIN_DELAY = 0.005
+
+
+class HedgePolicy:
+    """
+    Decides when an idempotent read gets a duplicate request. The delay is
+    the given percentile of recent latencies, and at most budget hedges are
+    sent per request overall, so the extra load stays bounded.
+    """
+
+    def __init__(
+        self,
+        percentile=HEDGE_PERCENTILE,
+        budget=HEDGE_BUDGET,
+        window=HEDGE_WINDOW,
+        min_samples=HEDGE_MIN_SAMPLES,
+        initial_delay=HEDGE_INITIAL_DELAY,
+        min_delay=HEDGE_MIN_DELAY,
+    ):
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be between 0 and 1")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.__lock = threading.Lock()
+        self.__latencies = deque(maxlen=window)
+        self.__requests = 0
+        self.__hedged = 0
+        self.__wins = 0
+
+    def delay(self) -> float:
+        with self.__lock:
+            if len(self.__latencies) < self.min_samples:
+                return self.initial_delay
+            latencies = sorted(self.__latencies)
+        rank = min(len(latencies) - 1, math.ceil(self.percentile * len(latencies)) - 1)
+        return max(self.min_delay, latencies[rank])
+
+    def start(self):
+        with self.__lock:
+            self.__requests += 1
+
+    def acquire(self) -> bool:
+        with self.__lock:
+            if self.__hedged + 1 > self.budget * self.__requests:
+                return False
+            self.__hedged += 1
+            return True
+
+    def observe(self, latency: float, hedge_won=False):
+        with self.__lock:
+            self.__latencies.append(latency)
+            if hedge_won:
+                self.__wins += 1
+
+    def stats(self) -> HedgeStats:
+        with self.__lock:
+            requests = self.__requests
+            return {
+                "requests": requests,
+                "hedged": self.__hedged,
+                "wins": self.__wins,
+                "hedge_rate": self.__hedged / requests if requests else 0.0,
+                "win_rate": self.__wins / self.__hedged if self.__hedged else 0.0,
+            }
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional
+
+LAZY_PAGE_SIZE = 20
+
+
+def hit_ids(res) -> List[str]:
+    """
+    Ids of an ids_only search response, which lists hits as either bare ids
+    or objects with an id.
+    """
+    hits = res.get("data") if isinstance(res, dict) else None
+    if not isinstance(hits, list):
+        return []
+    return [hit["id"] if isinstance(hit, dict) else hit for hit in hits]
+
+
+def documents(res) -> list:
+    """
+    Documents of a documents endpoint response, which holds either one
+    document or a list of them, bare or in a {"data": ...} envelope.
+    """
+    if enveloped(res):
+        res = res["data"]
+    return res if isinstance(res, list) else [res]
+
+
+def enveloped(res) -> bool:
+    return isinstance(res, dict) and "id" not in res and isinstance(res.get("data"), (list, dict))
+
+
+def by_id(docs: List[dict]) -> Dict[str, dict]:
+    return {doc["id"]: doc for doc in docs if isinstance(doc, dict) and "id" in doc}
+
+
+class LazyDocuments(Sequence):
+    """
+    Search hits whose documents are only fetched when read. Documents are
+    loaded a page at a time, and reading a page starts loading the next
+    one in the background. Ids the API returns no document for read as
+    None, and reading from a page that failed to load raises its error
+    and fetches it again. response holds the raw ids_only search response.
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        fetch_page: Callable[[List[str]], List[dict]],
+        page_size=LAZY_PAGE_SIZE,
+        prefetch=True,
+        response=None,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.ids = ids
+        self.response = response
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.__fetch_page = fetch_page
+        self.__lock = threading.Lock()
+        self.__pages = {}
+
+    def __load(self, page_no: int, background: bool) -> Optional[Future]:
+        start = page_no * self.page_size
+        if start >= len(self.ids):
+            return None
+
+        with self.__lock:
+            future = self.__pages.get(page_no)
+            if future is not None:
+                return future
+            future = Future()
+            self.__pages[page_no] = future
+
+        def run():
+            try:
+                future.set_result(by_id(self.__fetch_page(self.ids[start:start + self.page_size])))
+            except BaseException as e:
+                # Drop the failed page so the next read retries it
+                with self.__lock:
+                    del self.__pages[page_no]
+                future.set_exception(e)
+
+        if background:
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            run()
+        return future
+
+    def __get(self, i: int):
+        page_no = i // self.page_size
+        docs = self.__load(page_no, background=False).result()
+        if self.prefetch:
+            self.__load(page_no + 1, background=True)
+        return docs.get(self.ids[i])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.__get(j) for j in range(*i.indices(len(self.ids)))]
+        if i < 0:
+            i += len(self.ids)
+        if not 0 <= i < len(self.ids):
+            raise IndexError("document index out of range")
+        return self.__get(i)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class AsyncLazyDocuments:
+    """
+    asyncio counterpart of LazyDocuments: read with await get(i) or async
+    for. The next page is prefetched in a task.
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        fetch_page: Callable[[List[str]], Awaitable[List[dict]]],
+        page_size=LAZY_PAGE_SIZE,
+        prefetch=True,
+        response=None,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.ids = ids
+        self.response = response
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.__fetch_page = fetch_page
+        self.__pages = {}
+
+    async def __fetch(self, ids):
+        return by_id(await self.__fetch_page(ids))
+
+    def __load(self, page_no: int) -> Optional[asyncio.Future]:
+        start = page_no * self.page_size
+        if start >= len(self.ids):
+            return None
+
+        task = self.__pages.get(page_no)
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            task = asyncio.ensure_future(self.__fetch(self.ids[start:start + self.page_size]))
+            # A prefetched page nobody reads must not warn about an unretrieved exception
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+            self.__pages[page_no] = task
+        return task
+
+    async def get(self, i: int):
+        if i < 0:
+            i += len(self.ids)
+        if not 0 <= i < len(self.ids):
+            raise IndexError("document index out of range")
+
+        page_no = i // self.page_size
+        task = self.__load(page_no)
+        if self.prefetch:
+            self.__load(page_no + 1)
+        # Shielded so a cancelled reader does not cancel the page for others
+        docs = await asyncio.shield(task)
+        return docs.get(self.ids[i])
+
+    async def __aiter__(self):
+        for i in range(len(self.ids)):
+            yield await self.get(i)
+
+    def __len__(self):
+        return len(self.ids)
@@ -1,12 +1,62 @@
+import heapq
 import os
+import threading
+import time
 import mimetypes
 import httpx
-from typing import List
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Iterable, List, Optional, Union
+from .bulk import (
+    BULK_BATCH_SIZE,
+    BULK_DELETE_BATCH_SIZE,
+    BULK_MAX_BYTES,
+    BULK_MAX_WORKERS,
+    BULK_RETRIES,
+    BULK_RETRY_BACKOFF,
+    batch_result,
+    batched,
+    chunked,
+    finish,
+    id_chunks,
+    new_delete_report,
+    new_report,
+    record,
+    record_delete,
+)
+from .cache import SemanticCache, TTLCache
+from .checkpoint import Checkpoint
+from .circuit import CircuitBreaker
+from .encoding import (
+    Compression,
+    JsonCodec,
+    decode_body,
+    embedding_to_list,
+    encode_body,
+    encode_request,
+    get_codec,
+    with_embedding_list,
+)
+from .fingerprints import FingerprintStore, fingerprint
+from .hedge import HedgePolicy
+from .hydrate import LAZY_PAGE_SIZE, documents, enveloped, LazyDocuments, hit_ids
+from .singleflight import SingleFlight
+from .outbox import Outbox, is_transient
+from .pool import POOL_MAX_CONNECTIONS, PoolConfig, PoolMonitor
+from .ratelimit import RateLimiter, endpoint_class
+from .retry import RetryPolicy
+from .coalesce import IndexCoalescer
 from .typings import (
     IndexPayload,
     SearchPayload,
+    SearchManyResult,
+    FederatedSearchResult,
     TunePayload,
     BulkIndexItem,
+    BulkDeleteReport,
+    BulkIndexReport,
+    OutboxReplayReport,
+    PoolStats,
     DataSourcePayload,
     CreateIndexPayload,
     UpdateIndexPayload,
@@ -24,8 +74,35 @@ class Metal(httpx.Client):
     client_id: str
     index_id: str
 
-    def __init__(self, api_key, client_id, index_id=None, base_url=BASE_API, timeout=30.0):
-        super().__init__(timeout=timeout)
+    def __init__(
+        self,
+        api_key,
+        client_id,
+        index_id=None,
+        base_url=BASE_API,
+        timeout=30.0,
+        coalesce_window=None,
+        coalesce_max_batch=BULK_BATCH_SIZE,
+        outbox: Optional[Outbox] = None,
+        fingerprints: Optional[FingerprintStore] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+        compression: Optional[Compression] = None,
+        compact_embeddings=False,
+        search_cache: Optional[TTLCache] = None,
+        semantic_cache: Optional[SemanticCache] = None,
+        single_flight=False,
+        document_cache: Optional[TTLCache] = None,
+        hedging: Optional[HedgePolicy] = None,
+        pool: Optional[PoolConfig] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ):
+        if pool is None:
+            super().__init__(timeout=timeout)
+        else:
+            super().__init__(**pool.client_options(timeout))
+        self.pool_monitor = PoolMonitor(POOL_MAX_CONNECTIONS if pool is None else pool.max_connections)
         self.api_key = api_key
         self.client_id = client_id
         self.index_id = index_id
@@ -35,9 +112,70 @@ class Metal(httpx.Client):
             'x-metal-client-id': self.client_id,
         })
         self.base_url = base_url
+        self.codec = get_codec(json_codec)
+        self.compression = compression
+        self.compact_embeddings = compact_embeddings
+        self.single_flight = SingleFlight() if single_flight else None
+        self.search_cache = search_cache
+        self.semantic_cache = semantic_cache
+        self.document_cache = document_cache
+        self.hedging = hedging
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.__hedge_pool = None
+        if hedging is not None:
+            # One thread per connection the client may open, so reads don't queue behind the pool's default size
+            hedge_workers = self.pool_monitor.max_connections or POOL_MAX_CONNECTIONS
+            self.__hedge_pool = ThreadPoolExecutor(max_workers=hedge_workers, thread_name_prefix="metal-hedge")
+        self.outbox = outbox
+        self.fingerprints = fingerprints
+        self.coalescer = None
+        if coalesce_window is not None:
+            self.coalescer = IndexCoalescer(self.__send_coalesced, coalesce_max_batch, coalesce_window)
+
+    def close(self):
+        if self.coalescer is not None:
+            self.coalescer.close()
+        if self.__hedge_pool is not None:
+            self.__hedge_pool.shutdown(wait=False)
+        super().close()
+
+    def __exit__(self, *args):
+        if self.coalescer is not None:
+            self.coalescer.close()
+        if self.__hedge_pool is not None:
+            self.__hedge_pool.shutdown(wait=False)
+        super().__exit__(*args)
 
     def request(self, method, url, *args, **kwargs):
-        return super().request(method, url, *args, **kwargs)
+        endpoint = endpoint_class(url, method)
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.check(endpoint)
+
+        status_code = None
+        started = time.monotonic()
+        try:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve(endpoint)
+                if wait > 0:
+                    time.sleep(wait)
+                started = time.monotonic()
+
+            self.pool_monitor.enter()
+            try:
+                res = super().request(method, url, *args, **kwargs)
+            finally:
+                self.pool_monitor.exit()
+            status_code = res.status_code
+            return res
+        finally:
+            if self.circuit_breaker is not None:
+                failed = status_code is None or status_code >= 500
+                self.circuit_breaker.record(endpoint, time.monotonic() - started, failed)
+
+    def pool_stats(self) -> PoolStats:
+        return self.pool_monitor.stats(self._transport)
 
     def __getData(self, index, payload: dict = {}):
         data = {"index": index}
@@ -57,7 +195,7 @@ class Metal(httpx.Client):
         elif payload.get("text") is not None:
             data["text"] = payload["text"]
         elif payload.get("embedding") is not None:
-            data["embedding"] = payload["embedding"]
+            data["embedding"] = embedding_to_list(payload["embedding"], self.compact_embeddings)
 
         return data
 
@@ -73,59 +211,302 @@ class Metal(httpx.Client):
         ):
             raise TypeError("imageBase64, imageUrl, text, or embedding required")
 
-    def fetch(self, method, url, data, params=None, headers=None):
+    def __error_message(self, e: httpx.HTTPStatusError):
+        response_data = e.response.text
         try:
-            res = self.request(method, url, json=data, params=params, headers=headers)
-            res.raise_for_status()
-            if not res.content:
-                return
-            return res.json()
-        except httpx.HTTPStatusError as e:
-            response_data = e.response.text
+            # Try to decode it into a JSON object
+            response_data = e.response.json()
+        except Exception:
+            pass
+
+        status_code = e.response.status_code
+
+        if isinstance(response_data, dict):
+            error_detail = response_data.get('error', {})
+            nested_message = error_detail.get('message') if isinstance(error_detail, dict) else None
+            top_level_message = response_data.get('message')
+            immediate_error = response_data.get('error')
+        else:
+            nested_message = None
+            top_level_message = None
+            immediate_error = None
+
+        error_message = nested_message or top_level_message or immediate_error or f"HTTP {status_code} error"
+        return response_data, error_message
+
+    def __send(self, method, url, data, params=None, headers=None, idempotent=False):
+        if self.retry is None:
+            return self.__send_once(method, url, data, params, headers)
+
+        idempotent = idempotent or self.retry.idempotent(method, headers)
+        started = self.retry.start()
+        attempt = 0
+        while True:
             try:
-                # Try to decode it into a JSON object
-                response_data = e.response.json()
-            except Exception:
-                pass
-
-            status_code = e.response.status_code
-
-            if isinstance(response_data, dict):
-                error_detail = response_data.get('error', {})
-                nested_message = error_detail.get('message') if isinstance(error_detail, dict) else None
-                top_level_message = response_data.get('message')
-                immediate_error = response_data.get('error')
-            else:
-                nested_message = None
-                top_level_message = None
-                immediate_error = None
+                return self.__send_once(method, url, data, params, headers)
+            except httpx.HTTPError as e:
+                attempt += 1
+                delay = self.retry.next_delay(e, attempt, started, idempotent)
+                if delay is None:
+                    raise
+                logger.warning(f"Retrying {method} {url} in {delay:.2f}s after attempt {attempt} failed: {e}")
+                time.sleep(delay)
+
+    def __send_once(self, method, url, data, params=None, headers=None):
+        body, compressed = encode_request(self.codec, self.compression, data, headers)
+        res = self.request(method, url, params=params, **body)
+        if compressed and res.status_code == 415:
+            logger.warning(f"{self.compression.encoding} request bodies rejected by {url}, sending uncompressed")
+            self.compression.enabled = False
+            body, _ = encode_request(self.codec, self.compression, data, headers)
+            res = self.request(method, url, params=params, **body)
+
+        res.raise_for_status()
+        if not res.content:
+            return
+        return decode_body(self.codec, res)
+
+    def __handle_error(self, url, e: httpx.HTTPStatusError):
+        response_data, error_message = self.__error_message(e)
+
+        formatted_error = f"\n{'='*60}\nError occurred while accessing {url}: {error_message}\n{'='*60}\n"
+        logger.exception(formatted_error)
+
+        # Returning the error JSON body
+        return response_data
+
+    def fetch(self, method, url, data, params=None, headers=None, hedge=False):
+        try:
+            if hedge:
+                return self.__read(method, url, data)
+            return self.__send(method, url, data, params=params, headers=headers)
+        except httpx.HTTPStatusError as e:
+            return self.__handle_error(url, e)
+
+    def __read(self, method, url, data):
+        if self.hedging is None:
+            return self.__send(method, url, data, idempotent=True)
+        return self.__hedged(lambda: self.__send(method, url, data, idempotent=True))
+
+    def __hedged(self, call):
+        policy = self.hedging
+        policy.start()
+        running = threading.Event()
+
+        def run_primary():
+            running.set()
+            return call()
+
+        primary = self.__hedge_pool.submit(run_primary)
+        # Time spent queued for a worker must not count towards the hedge delay
+        running.wait()
+        started = time.monotonic()
+        done, _ = wait([primary], timeout=policy.delay())
+        if done or not policy.acquire():
+            res = primary.result()
+            policy.observe(time.monotonic() - started)
+            return res
 
-            error_message = nested_message or top_level_message or immediate_error or f"HTTP {status_code} error"
+        backup = self.__hedge_pool.submit(call)
+        pending = {primary, backup}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Prefer a successful response, and only raise once both requests failed
+            for future in sorted(done, key=lambda future: future.exception() is not None):
+                if future.exception() is None or not pending:
+                    # The slower request can't be interrupted and is left to finish in the pool
+                    policy.observe(time.monotonic() - started, hedge_won=future is backup)
+                    return future.result()
+
+    def __settle(self, seq, status_code=None):
+        if seq is None:
+            return
+        if status_code is None or not is_transient(status_code):
+            self.outbox.ack(seq)
+
+    def __fetch_logged(self, method, url, data, on_success=None):
+        seq = self.outbox.append(method, url, data) if self.outbox is not None else None
+        try:
+            res = self.__send(method, url, data)
+        except httpx.HTTPStatusError as e:
+            self.__settle(seq, e.response.status_code)
+            return self.__handle_error(url, e)
+        self.__settle(seq)
+        if on_success is not None:
+            on_success()
+        return res
 
-            formatted_error = f"\n{'='*60}\nError occurred while accessing {url}: {error_message}\n{'='*60}\n"
-            logger.exception(formatted_error)
+    def __fingerprint_entries(self, items):
+        return [
+            (item["index"], item["id"], fingerprint(self.__getData(item["index"], item)))
+            for item in items
+            if item.get("id") is not None
+        ]
+
+    def __drop_unchanged(self, items):
+        if self.fingerprints is None:
+            return items, []
+
+        entries = self.__fingerprint_entries(items)
+        changed = self.fingerprints.changed(entries)
+        kept = [item for item in items if item.get("id") is None or (item["index"], item["id"]) in changed]
+        return kept, [entry for entry in entries if (entry[0], entry[1]) in changed]
+
+    def __remember(self, entries):
+        if self.fingerprints is not None and entries:
+            self.fingerprints.put(entries)
+
+    def __shared(self, key, call):
+        if self.single_flight is None:
+            return call()
+        return self.single_flight.do(key, call)
+
+    def __invalidate(self, indexes):
+        if self.search_cache is not None:
+            self.search_cache.invalidate(lambda key: key[0] in indexes)
+        if self.semantic_cache is not None:
+            self.semantic_cache.invalidate(lambda scope: scope[0] in indexes)
+
+    def __invalidate_documents(self, index, ids):
+        if self.document_cache is not None:
+            for id in ids:
+                self.document_cache.delete((index, id))
+
+    def replay_outbox(self) -> OutboxReplayReport:
+        if self.outbox is None:
+            raise TypeError("outbox required")
+
+        report = {"replayed": 0, "rejected": 0, "pending": 0}
+        for entry in self.outbox.pending():
+            try:
+                self.__send(entry["method"], entry["url"], entry["data"])
+            except httpx.HTTPStatusError as e:
+                if is_transient(e.response.status_code):
+                    report["pending"] += 1
+                    continue
+                _, error_message = self.__error_message(e)
+                logger.error(f"Outbox record {entry['seq']} rejected: {error_message}")
+                report["rejected"] += 1
+            except httpx.HTTPError as e:
+                logger.error(f"Outbox record {entry['seq']} failed: {e}")
+                report["pending"] += 1
+                continue
+            else:
+                report["replayed"] += 1
+            self.outbox.ack(entry["seq"])
 
-            # Returning the error JSON body
-            return response_data
+        return report
 
     def index(self, payload: IndexPayload = {}, index_id=None):
         index = self.index_id or index_id
         self.__validateIndex(index, payload)
         data = self.__getData(index, payload)
         url = "/v1/index"
-        res = self.fetch("post", url, data)
-        return res
 
-    def index_many(self, payload: List[BulkIndexItem]):
-        url = "/v1/index/bulk"
+        kept, entries = self.__drop_unchanged([data])
+        if not kept:
+            return {"skipped": True}
+
+        try:
+            if self.coalescer is not None:
+                return self.coalescer.submit(data).result()
+
+            res = self.__fetch_logged("post", url, data, on_success=lambda: self.__remember(entries))
+            return res
+        finally:
+            self.__invalidate({index})
+            if data.get("id") is not None:
+                self.__invalidate_documents(index, [data["id"]])
 
+    def __with_index(self, payload):
         for item in payload:
             if item.get("index") is None:
-                item["index"] = self.index_id
+                # Only items without an index are copied, the caller's dict is left untouched
+                item = dict(item, index=self.index_id)
+            yield with_embedding_list(item, self.compact_embeddings)
+
+    def __send_coalesced(self, items):
+        return self.__fetch_logged(
+            "post",
+            "/v1/index/bulk",
+            {"data": items},
+            on_success=lambda: self.__remember(self.__fingerprint_entries(items) if self.fingerprints else []),
+        )
+
+    def __index_batch(self, url, batch_no, batch):
+        size = len(batch)
+        batch, entries = self.__drop_unchanged(batch)
+        skipped = size - len(batch)
+        if not batch:
+            return batch_result(batch_no, 0, skipped=skipped)
+
+        data = {"data": batch}
+        seq = self.outbox.append("post", url, data) if self.outbox is not None else None
+        try:
+            res = self.__send("post", url, data)
+        except httpx.HTTPStatusError as e:
+            self.__settle(seq, e.response.status_code)
+            _, error_message = self.__error_message(e)
+            logger.error(f"Bulk index batch {batch_no} failed: {error_message}")
+            return batch_result(batch_no, len(batch), error=error_message, skipped=skipped)
+        except httpx.HTTPError as e:
+            logger.error(f"Bulk index batch {batch_no} failed: {e}")
+            return batch_result(batch_no, len(batch), error=str(e) or type(e).__name__, skipped=skipped)
+        finally:
+            # Only once the write is done, a read racing it would cache the old results again
+            self.__invalidate({item["index"] for item in batch})
+            for item in batch:
+                if item.get("id") is not None:
+                    self.__invalidate_documents(item["index"], [item["id"]])
+        self.__settle(seq)
+        self.__remember(entries)
+        return batch_result(batch_no, len(batch), response=res, skipped=skipped)
+
+    def index_many(
+        self,
+        payload: Iterable[BulkIndexItem],
+        batch_size=BULK_BATCH_SIZE,
+        max_workers=BULK_MAX_WORKERS,
+        max_batch_bytes=BULK_MAX_BYTES,
+        checkpoint: Optional[Checkpoint] = None,
+    ) -> BulkIndexReport:
+        url = "/v1/index/bulk"
+        report = new_report()
+        starts = {}
 
-        data = {"data": payload}
-        res = self.fetch("post", url, data)
-        return res
+        def collect(result):
+            record(report, result)
+            if checkpoint is not None:
+                checkpoint.complete(starts.pop(result["batch"]), result)
+
+        offset = 0
+        if checkpoint is not None:
+            # Skip what a previous run already got through
+            offset = checkpoint.start()
+            payload = islice(payload, offset, None)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = set()
+                for batch_no, batch in enumerate(batched(self.__with_index(payload), batch_size, max_batch_bytes)):
+                    starts[batch_no] = offset
+                    offset += len(batch)
+
+                    # Keep at most max_workers batches in memory at once
+                    if len(pending) >= max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+
+                    pending.add(executor.submit(self.__index_batch, url, batch_no, batch))
+
+                for future in pending:
+                    collect(future.result())
+        finally:
+            if checkpoint is not None:
+                checkpoint.save()
+
+        return finish(report)
 
     def search(
         self, payload: SearchPayload = {}, index_id=None, ids_only=False, limit=1
@@ -135,16 +516,161 @@ class Metal(httpx.Client):
         if index is None:
             raise TypeError("index_id required")
 
-        data = self.__getData(index, payload)
+        url = self.__search_url(ids_only, limit)
+        try:
+            res = self.__search(index, payload, url, ids_only, limit)
+        except httpx.HTTPStatusError as e:
+            return self.__handle_error(url, e)
+        return res
 
+    def __search_url(self, ids_only, limit):
         url = "/v1/search?limit=" + str(limit)
 
         if ids_only:
             url = url + "&idsOnly=true"
 
-        res = self.fetch("post", url, data)
+        return url
+
+    def __search(self, index, payload, url, ids_only, limit):
+        data = self.__getData(index, payload)
+
+        key = None
+        if self.search_cache is not None:
+            key = (index, fingerprint(data), limit, bool(ids_only))
+            found, res = self.search_cache.get(key)
+            if found:
+                return res
+
+        scope = None
+        if self.semantic_cache is not None and data.get("embedding") is not None:
+            # Near-identical embeddings only share results under the same filters and limit
+            rest = {field: value for field, value in data.items() if field != "embedding"}
+            scope = (index, fingerprint(rest), limit, bool(ids_only))
+            found, res = self.semantic_cache.get(scope, data["embedding"])
+            if found:
+                return res
+
+        flight = ("post", url, fingerprint(data)) if self.single_flight is not None else None
+        res = self.__shared(flight, lambda: self.__read("post", url, data))
+
+        # Only successful responses are cached
+        if key is not None:
+            self.search_cache.set(key, res)
+        if scope is not None:
+            self.semantic_cache.set(scope, data["embedding"], res)
         return res
 
+    def search_indexes(
+        self,
+        payload: SearchPayload,
+        indexes: List[str],
+        ids_only=False,
+        limit=1,
+        index_timeout: Optional[float] = None,
+        score_key="dist",
+        descending=False,
+    ) -> FederatedSearchResult:
+        """
+        Search several indexes in parallel and merge their results into a
+        single top-limit list by score_key, lowest first as for the API's
+        dist, or highest first with descending. Each hit is tagged with
+        its index, bare ids of an ids_only search become {"id": ...}
+        hits. Indexes that fail or take longer than index_timeout seconds
+        are left out and listed in failed.
+        """
+        if not indexes:
+            raise TypeError("indexes required")
+
+        url = self.__search_url(ids_only, limit)
+
+        def search_index(index):
+            try:
+                return self.__search(index, payload, url, ids_only, limit)
+            except httpx.HTTPStatusError as e:
+                return self.__error_message(e)[1]
+            except httpx.HTTPError as e:
+                return str(e) or type(e).__name__
+
+        executor = ThreadPoolExecutor(max_workers=max(1, len(indexes)))
+        futures = {executor.submit(search_index, index): index for index in indexes}
+        done, _ = wait(futures, timeout=index_timeout)
+        # A shard that timed out is abandoned, its request ends on the client timeout
+        executor.shutdown(wait=False)
+        responses = {
+            index: future.result() if future in done else f"timed out after {index_timeout}s"
+            for future, index in futures.items()
+        }
+
+        hits = []
+        failed = {}
+        for index, res in responses.items():
+            if isinstance(res, str):
+                logger.error(f"Search of index {index} failed: {res}")
+                failed[index] = res
+                continue
+            for hit in (res or {}).get("data") or []:
+                if not isinstance(hit, dict):
+                    hit = {"id": hit}
+                hits.append(dict(hit, index=hit.get("index", index)))
+
+        # Hits without a score rank last either way
+        if descending:
+            top = heapq.nlargest(limit, hits, key=lambda hit: hit.get(score_key, float("-inf")))
+        else:
+            top = heapq.nsmallest(limit, hits, key=lambda hit: hit.get(score_key, float("inf")))
+        return {"data": top, "failed": failed}
+
+    def search_lazy(
+        self, payload: SearchPayload = {}, index_id=None, limit=1, page_size=LAZY_PAGE_SIZE, prefetch=True
+    ) -> LazyDocuments:
+        """
+        Run an ids_only search and return its hits as a lazy sequence whose
+        documents are fetched with get_many, a page at a time, when read.
+        """
+        index = index_id or self.index_id
+        res = self.search(payload, index_id=index, ids_only=True, limit=limit)
+
+        def fetch_page(ids):
+            # Unlike get_many, raises on an error response so the page is fetched again on the next read
+            return self.__get_many(index, ids)
+
+        return LazyDocuments(hit_ids(res), fetch_page, page_size=page_size, prefetch=prefetch, response=res)
+
+    def search_many(
+        self,
+        queries: Iterable[SearchPayload],
+        index_id=None,
+        ids_only=False,
+        limit=1,
+        max_workers=BULK_MAX_WORKERS,
+    ) -> List[SearchManyResult]:
+        """
+        Run many searches concurrently over the client's connection pool.
+        Results come back in query order, each with its latency in seconds.
+        """
+        index = index_id or self.index_id
+        if index is None:
+            raise TypeError("index_id required")
+
+        url = self.__search_url(ids_only, limit)
+
+        def run(numbered):
+            query_no, query = numbered
+            started = time.perf_counter()
+            try:
+                res = self.__search(index, query, url, ids_only, limit)
+            except httpx.HTTPStatusError as e:
+                error = self.__error_message(e)[1]
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+            else:
+                return {"query": query_no, "latency": time.perf_counter() - started, "response": res}
+            return {"query": query_no, "latency": time.perf_counter() - started, "error": error}
+
+        queries = list(queries)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(queries)))) as executor:
+            return list(executor.map(run, enumerate(queries)))
+
     def tune(self, payload: TunePayload = {}, index_id=None):
         index = index_id or self.index_id
 
@@ -162,6 +688,7 @@ class Metal(httpx.Client):
         data = {"index": index, "idA": idA, "idB": idB, "label": label}
 
         res = self.fetch("post", url, data)
+        self.__invalidate({index})
         return res
 
     def get_one(self, id: str, index_id=None):
@@ -175,28 +702,78 @@ class Metal(httpx.Client):
 
         url = "/v1/indexes/" + index + "/documents/" + id
 
-        res = self.fetch("get", url, None)
+        if self.document_cache is None:
+            res = self.__shared(("get", url), lambda: self.fetch("get", url, None, hedge=True))
+            return res
+
+        found, entry = self.document_cache.get((index, id))
+        if found:
+            # Entries hold the bare document, shared with get_many, and whether its response was enveloped
+            doc, wrapped = entry
+            return {"data": doc} if wrapped else doc
+
+        try:
+            res = self.__shared(("get", url), lambda: self.__read("get", url, None))
+        except httpx.HTTPStatusError as e:
+            return self.__handle_error(url, e)
+
+        for doc in documents(res):
+            if isinstance(doc, dict) and doc.get("id") == id:
+                self.document_cache.set((index, id), (doc, enveloped(res)))
         return res
 
-    def get_many(self, ids: List[str], index_id=None):
+    def get_many(self, ids: List[str], index_id=None, max_workers=BULK_MAX_WORKERS):
         index = index_id or self.index_id
 
-        if not (1 < len(ids) <= 100):
-            raise TypeError("ids should be between 1 and 100")
+        if not ids:
+            raise TypeError("ids required")
 
         if index is None:
             raise TypeError("index_id required")
 
-        id_str = ",".join(ids)
-
-        url = "/v1/indexes/" + index + "/documents/" + id_str
-
-        res = self.fetch("get", url, None)
-
-        if isinstance(res, list):
-            return res
+        try:
+            return self.__get_many(index, ids, max_workers)
+        except httpx.HTTPStatusError as e:
+            return [self.__handle_error(e.request.url, e)]
+
+    def __get_many(self, index, ids, max_workers=BULK_MAX_WORKERS):
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        missing = ids
+        if self.document_cache is not None:
+            missing = []
+            for id in ids:
+                hit, entry = self.document_cache.get((index, id))
+                if hit:
+                    found[id] = entry[0]
+                else:
+                    missing.append(id)
+
+        chunks = list(id_chunks(missing))
+        if len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+                results = list(executor.map(lambda chunk: self.__get_chunk(index, chunk), chunks))
         else:
-            return [res]
+            results = [self.__get_chunk(index, chunk) for chunk in chunks]
+
+        wanted = set(missing)
+        unkeyed = []
+        for docs, wrapped in results:
+            for doc in docs:
+                if isinstance(doc, dict) and doc.get("id") in wanted:
+                    found[doc["id"]] = doc
+                    if self.document_cache is not None:
+                        self.document_cache.set((index, doc["id"]), (doc, wrapped))
+                else:
+                    unkeyed.append(doc)
+
+        # Ids the API did not return are left out
+        return [found[id] for id in ids if id in found] + unkeyed
+
+    def __get_chunk(self, index, ids):
+        url = "/v1/indexes/" + index + "/documents/" + ",".join(ids)
+        res = self.__shared(("get", url), lambda: self.__read("get", url, None))
+        return documents(res), enveloped(res)
 
     def delete_one(self, id: str, index_id=None):
         index = index_id or self.index_id
@@ -207,12 +784,25 @@ class Metal(httpx.Client):
         if index is None:
             raise TypeError("index_id required")
 
+        if self.fingerprints is not None:
+            self.fingerprints.forget(index, [id])
+
         url = "/v1/indexes/" + index + "/documents/" + id
 
         res = self.fetch("delete", url, None)
+        self.__invalidate({index})
+        self.__invalidate_documents(index, [id])
         return res
 
-    def delete_many(self, ids: List[str], index_id=None):
+    def delete_many(
+        self,
+        ids: List[str],
+        index_id=None,
+        batch_size=BULK_DELETE_BATCH_SIZE,
+        max_workers=BULK_MAX_WORKERS,
+        retries=BULK_RETRIES,
+        retry_backoff=BULK_RETRY_BACKOFF,
+    ) -> BulkDeleteReport:
         index = index_id or self.index_id
 
         if index is None:
@@ -221,10 +811,48 @@ class Metal(httpx.Client):
         if ids is None:
             raise TypeError("ids required")
 
-        url = f'/v1/indexes/{index}/documents/bulk'
-        data = {"ids": ids}
-        res = self.fetch("delete", url, data)
-        return res
+        if self.fingerprints is not None:
+            self.fingerprints.forget(index, ids)
+
+        url = "/v1/indexes/" + index + "/documents/bulk"
+        chunks = list(chunked(ids, batch_size))
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+                errors = list(executor.map(lambda chunk: self.__delete_chunk(url, chunk, retries, retry_backoff), chunks))
+        finally:
+            self.__invalidate({index})
+            self.__invalidate_documents(index, ids)
+
+        report = new_delete_report()
+        for chunk, error in zip(chunks, errors):
+            record_delete(report, chunk, error)
+        return report
+
+    def __delete_chunk(self, url, chunk, retries, retry_backoff):
+        data = {"ids": chunk}
+        seq = self.outbox.append("delete", url, data) if self.outbox is not None else None
+        error = None
+        # A client RetryPolicy already retries inside __send, retrying here as well would multiply the attempts
+        attempts = 1 if self.retry is not None else retries + 1
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(retry_backoff * 2 ** (attempt - 1))
+            try:
+                self.__send("delete", url, data)
+            except httpx.HTTPStatusError as e:
+                _, error = self.__error_message(e)
+                if not is_transient(e.response.status_code):
+                    self.__settle(seq, e.response.status_code)
+                    break
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+            else:
+                self.__settle(seq)
+                return None
+
+        # A chunk that still fails transiently stays in the outbox for replay
+        logger.error(f"Bulk delete of {len(chunk)} ids failed: {error}")
+        return error
 
     def __sanitize_filename(self, filename):
         """
@@ -241,10 +869,10 @@ class Metal(httpx.Client):
         }
         headers = {'x-metal-file-size': str(file_size)}
 
-        res = self.request("post", url, json=payload, headers=headers)
+        res = self.request("post", url, headers=headers, **encode_body(self.codec, payload))
         res.raise_for_status()  # Raise exception if the request failed
 
-        return res.json()
+        return decode_body(self.codec, res)
 
     def __upload_file_to_url(self, url, file_path, file_type, file_size):
         with open(file_path, 'rb') as f:
@@ -410,7 +1038,7 @@ class Metal(httpx.Client):
             raise TypeError("index_id is required")
 
         url = f"/v1/indexes/{index_id}"
-        res = self.fetch("get", url, None)
+        res = self.__shared(("get", url), lambda: self.fetch("get", url, None, hedge=True))
         return res
 
     def update_index(self, index_id: str, payload: UpdateIndexPayload) -> dict:
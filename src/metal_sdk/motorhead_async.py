@@ -1,15 +1,25 @@
+import asyncio
 import httpx
-from .typings import MotorheadPayload
+from .encoding import decode_body, encode_body, get_codec
+from .pool import POOL_MAX_CONNECTIONS, PoolMonitor
+from .typings import MotorheadPayload, PoolStats
 
 API_URL = 'https://api.getmetal.io/v1/motorhead/'
 
 
 class Motorhead(httpx.AsyncClient):
     def __init__(self, payload: MotorheadPayload = {}):
-        super().__init__()
+        pool = payload.get("pool")
+        if pool is None:
+            super().__init__()
+        else:
+            super().__init__(**pool.client_options())
+        self.pool_monitor = PoolMonitor(POOL_MAX_CONNECTIONS if pool is None else pool.max_connections)
+        self.rate_limiter = payload.get("rate_limiter")
         self.api_key = payload.get("api_key")
         self.client_id = payload.get("client_id")
         self.base_url = payload.get("base_url") or API_URL
+        self.codec = get_codec(payload.get("json_codec"))
 
         has_api_key = self.api_key is not None
         has_client_id = self.client_id is not None
@@ -25,14 +35,25 @@ class Motorhead(httpx.AsyncClient):
         })
 
     async def request(self, method, url, *args, **kwargs):
-        return await super().request(method, url, *args, **kwargs)
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.reserve("motorhead")
+            if wait > 0:
+                await asyncio.sleep(wait)
+        self.pool_monitor.enter()
+        try:
+            return await super().request(method, url, *args, **kwargs)
+        finally:
+            self.pool_monitor.exit()
+
+    def pool_stats(self) -> PoolStats:
+        return self.pool_monitor.stats(self._transport)
 
     async def add_memory(self, sessionId, payload):
         url = f'/sessions/{sessionId}/memory'
-        res = await self.request("post", url, json=payload)
+        res = await self.request("post", url, **encode_body(self.codec, payload))
         res.raise_for_status()
 
-        data = res.json()
+        data = decode_body(self.codec, res)
         memory = data.get('data', data)
         return memory
 
@@ -40,7 +61,7 @@ class Motorhead(httpx.AsyncClient):
         url = f'/sessions/{sessionId}/memory'
         res = await self.request("get", url)
         res.raise_for_status()
-        data = res.json()
+        data = decode_body(self.codec, res)
         memory = data.get('data', data)
         return memory
 
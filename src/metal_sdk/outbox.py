@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from typing import List
+from .typings import OutboxRecord
+
+OUTBOX_COMPACT_THRESHOLD = 10000
+
+# Failures the server may not have processed, these stay in the outbox for replay
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class Outbox:
+    """
+    Append-only log of write requests. A record is appended before its
+    request is sent and an ack line is appended once the server answered,
+    so whatever is still pending after a crash can be replayed.
+    """
+
+    def __init__(self, path: str, fsync=True, compact_threshold=OUTBOX_COMPACT_THRESHOLD):
+        self.path = path
+        self.fsync = fsync
+        self.compact_threshold = compact_threshold
+        self.__lock = threading.Lock()
+        self.__pending = {}
+        self.__next_seq = 0
+        self.__acked = 0
+        self.__load()
+        self.__file = open(self.path, "a", encoding="utf-8")
+
+    def __load(self):
+        if not os.path.exists(self.path):
+            return
+
+        end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A torn write from a crash, that record was never sent
+                    break
+                end += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+
+                if "ack" in entry:
+                    self.__pending.pop(entry["ack"], None)
+                    self.__acked += 1
+                else:
+                    self.__pending[entry["seq"]] = entry
+                    self.__next_seq = max(self.__next_seq, entry["seq"] + 1)
+
+        # New records must not be appended to the torn fragment
+        if end < os.path.getsize(self.path):
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+
+    def __write(self, entry: dict):
+        self.__file.write(json.dumps(entry) + "\n")
+        self.__file.flush()
+        if self.fsync:
+            os.fsync(self.__file.fileno())
+
+    def append(self, method: str, url: str, data) -> int:
+        with self.__lock:
+            seq = self.__next_seq
+            self.__next_seq += 1
+            entry = {"seq": seq, "method": method, "url": url, "data": data}
+            self.__write(entry)
+            self.__pending[seq] = entry
+            return seq
+
+    def ack(self, seq: int):
+        with self.__lock:
+            if self.__pending.pop(seq, None) is None:
+                return
+            self.__write({"ack": seq})
+            self.__acked += 1
+            if self.__acked >= self.compact_threshold:
+                self.__compact()
+
+    def pending(self) -> List[OutboxRecord]:
+        with self.__lock:
+            return [self.__pending[seq] for seq in sorted(self.__pending)]
+
+    def __compact(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for seq in sorted(self.__pending):
+                f.write(json.dumps(self.__pending[seq]) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.__file.close()
+        os.replace(tmp_path, self.path)
+        self.__file = open(self.path, "a", encoding="utf-8")
+        self.__acked = 0
+
+    def compact(self):
+        with self.__lock:
+            self.__compact()
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
+
+
+def is_transient(status_code: int) -> bool:
+    return status_code in TRANSIENT_STATUS_CODES
@@ -0,0 +1,81 @@
+import threading
+from typing import Optional
+import httpx
+from .typings import PoolStats
+
+POOL_MAX_CONNECTIONS = 100
+POOL_MAX_KEEPALIVE = 20
+POOL_KEEPALIVE_EXPIRY = 5.0
+DEFAULT_TIMEOUT = 5.0
+
+
+class PoolConfig:
+    """
+    Connection pool settings for the Metal and Motorhead clients. The
+    defaults match httpx's. pool_timeout bounds the wait for a free
+    connection and defaults to the client timeout. http2 needs the h2
+    package (pip install httpx[http2]).
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = POOL_MAX_CONNECTIONS,
+        max_keepalive_connections: Optional[int] = POOL_MAX_KEEPALIVE,
+        keepalive_expiry: Optional[float] = POOL_KEEPALIVE_EXPIRY,
+        http2=False,
+        pool_timeout: Optional[float] = None,
+    ):
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.pool_timeout = pool_timeout
+
+    def client_options(self, timeout=DEFAULT_TIMEOUT) -> dict:
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        pool_timeout = timeout if self.pool_timeout is None else self.pool_timeout
+        return {"limits": limits, "http2": self.http2, "timeout": httpx.Timeout(timeout, pool=pool_timeout)}
+
+
+class PoolMonitor:
+    """
+    Counts requests going through a client, to report alongside the
+    connections its transport holds.
+    """
+
+    def __init__(self, max_connections: Optional[int] = POOL_MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__in_flight = 0
+        self.__peak_in_flight = 0
+
+    def enter(self):
+        with self.__lock:
+            self.__requests += 1
+            self.__in_flight += 1
+            self.__peak_in_flight = max(self.__peak_in_flight, self.__in_flight)
+
+    def exit(self):
+        with self.__lock:
+            self.__in_flight -= 1
+
+    def stats(self, transport=None) -> PoolStats:
+        # httpcore's pool is reached through httpx's default transport, other transports report no connections
+        connections = getattr(getattr(transport, "_pool", None), "connections", [])
+        idle = sum(1 for connection in connections if connection.is_idle())
+        with self.__lock:
+            in_flight = self.__in_flight
+            return {
+                "requests": self.__requests,
+                "in_flight": in_flight,
+                "peak_in_flight": self.__peak_in_flight,
+                "connections": len(connections),
+                "idle_connections": idle,
+                "max_connections": self.max_connections,
+                "utilization": in_flight / self.max_connections if self.max_connections else 0.0,
+            }
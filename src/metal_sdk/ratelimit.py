@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ENDPOINT_CLASSES = ("index", "search", "files", "motorhead", "default")
+
+
+def endpoint_class(url, method="GET") -> str:
+    """
+    index covers ingestion only: index, bulk index, tune and document
+    deletes. Document and index reads under v1/indexes/ fall in default,
+    so bulk ingestion does not throttle or trip the read path.
+    """
+    path = urlsplit(str(url)).path.strip("/")
+    if path.startswith("v1/search"):
+        return "search"
+    if path.startswith(("v1/datasources", "v1/data-entities")):
+        return "files"
+    if path.startswith("v1/indexes/") and path.endswith("/files"):
+        return "files"
+    if path in ("v1/index", "v1/index/bulk", "v1/tune"):
+        return "index"
+    if path.startswith("v1/indexes/") and "/documents/" in path and method.upper() == "DELETE":
+        return "index"
+    return "default"
+
+
+class TokenBucket:
+    """
+    Allows rate requests per second on average with bursts of up to burst.
+    reserve takes a token right away and returns how long the caller must
+    wait before using it, so blocking and asyncio callers share a bucket.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self.clock = clock
+        self.__lock = threading.Lock()
+        self.__tokens = self.burst
+        self.__updated = clock()
+
+    def reserve(self, tokens=1.0) -> float:
+        with self.__lock:
+            now = self.clock()
+            self.__tokens = min(self.burst, self.__tokens + (now - self.__updated) * self.rate)
+            self.__updated = now
+            # Tokens may go negative, later callers queue up behind the debt
+            self.__tokens -= tokens
+            return max(0.0, -self.__tokens / self.rate)
+
+
+class FileTokenBucket:
+    """
+    TokenBucket whose state lives in a small JSON file guarded by an
+    exclusive flock, so every process on the host using the same path
+    shares one quota. Requires a POSIX system.
+    """
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.time):
+        if fcntl is None:
+            raise ImportError("FileTokenBucket requires fcntl")
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.path = path
+        self.rate = rate
+        self.burst = rate if burst is None else burst
+        self.clock = clock
+        self.__lock = threading.Lock()
+
+    def reserve(self, tokens=1.0) -> float:
+        with self.__lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                with os.fdopen(os.dup(fd), "r+", encoding="utf-8") as f:
+                    now = self.clock()
+                    try:
+                        state = json.loads(f.read())
+                    except ValueError:
+                        state = {"tokens": self.burst, "updated": now}
+
+                    available = min(self.burst, state["tokens"] + (now - state["updated"]) * self.rate) - tokens
+                    f.seek(0)
+                    f.truncate()
+                    f.write(json.dumps({"tokens": available, "updated": now}))
+                return max(0.0, -available / self.rate)
+            finally:
+                # Closing the descriptor releases the lock
+                os.close(fd)
+
+
+class RateLimiter:
+    """
+    Token buckets per endpoint class (index, search, files, motorhead or
+    default). Classes without a bucket are not limited. One limiter can be
+    shared by several clients to hold them all to the account's quota.
+    """
+
+    def __init__(self, buckets: Dict[str, TokenBucket]):
+        unknown = set(buckets) - set(ENDPOINT_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown endpoint classes: {', '.join(sorted(unknown))}")
+        self.buckets = buckets
+
+    def reserve(self, endpoint: str) -> float:
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            return 0.0
+        return bucket.reserve()
@@ -0,0 +1,123 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+import httpx
+from .outbox import TRANSIENT_STATUS_CODES
+from .typings import RetryStats
+
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 0.1
+RETRY_MAX_BACKOFF = 10.0
+RETRY_BUDGET_RATIO = 0.2
+RETRY_BUDGET_RESERVE = 10.0
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# The request never reached the server, so even a non-idempotent one is safe to resend
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    Retries transient failures of idempotent requests, and of others that
+    carry an Idempotency-Key header, with exponential backoff and full
+    jitter. A Retry-After header sets the minimum wait. No retry is made
+    past deadline seconds from the first attempt. Every request adds
+    budget_ratio to a shared budget of at most budget_reserve retries,
+    and every retry spends one, so a brownout can't turn into a retry
+    storm.
+    """
+
+    def __init__(
+        self,
+        max_attempts=RETRY_MAX_ATTEMPTS,
+        backoff=RETRY_BACKOFF,
+        max_backoff=RETRY_MAX_BACKOFF,
+        deadline: Optional[float] = None,
+        budget_ratio=RETRY_BUDGET_RATIO,
+        budget_reserve=RETRY_BUDGET_RESERVE,
+        status_codes=TRANSIENT_STATUS_CODES,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.budget_ratio = budget_ratio
+        self.budget_reserve = budget_reserve
+        self.status_codes = status_codes
+        self.clock = clock
+        self.jitter = jitter
+        self.__lock = threading.Lock()
+        self.__budget = budget_reserve
+        self.__requests = 0
+        self.__retries = 0
+        self.__exhausted = 0
+
+    def idempotent(self, method: str, headers=None) -> bool:
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return any(name.lower() == "idempotency-key" for name in headers or {})
+
+    def start(self) -> float:
+        with self.__lock:
+            self.__requests += 1
+            self.__budget = min(self.budget_reserve, self.__budget + self.budget_ratio)
+        return self.clock()
+
+    def next_delay(self, error: Exception, attempt: int, started: float, idempotent: bool) -> Optional[float]:
+        """
+        Seconds to wait before retrying after the given failed attempt,
+        counted from 1, or None when the error should be raised.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        if isinstance(error, httpx.HTTPStatusError):
+            if not idempotent or error.response.status_code not in self.status_codes:
+                return None
+            minimum = retry_after(error.response) or 0.0
+        elif isinstance(error, UNSENT_ERRORS) or (idempotent and isinstance(error, httpx.TransportError)):
+            minimum = 0.0
+        else:
+            return None
+
+        delay = max(minimum, self.jitter() * min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+        if self.deadline is not None and self.clock() - started + delay > self.deadline:
+            return None
+
+        with self.__lock:
+            if self.__budget < 1:
+                self.__exhausted += 1
+                return None
+            self.__budget -= 1
+            self.__retries += 1
+        return delay
+
+    def stats(self) -> RetryStats:
+        with self.__lock:
+            return {
+                "requests": self.__requests,
+                "retries": self.__retries,
+                "budget_exhausted": self.__exhausted,
+                "budget": self.__budget,
+            }
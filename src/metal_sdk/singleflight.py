@@ -0,0 +1,79 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable
+from .typings import SingleFlightStats
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one: the first
+    caller runs the call, callers arriving while it is in flight wait for
+    and share its result or exception.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls = {}
+        self.__executed = 0
+        self.__shared = 0
+
+    def do(self, key: Hashable, call: Callable[[], object]):
+        with self.__lock:
+            future = self.__calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.__calls[key] = future
+                self.__executed += 1
+            else:
+                self.__shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            res = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(res)
+            return res
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+    def stats(self) -> SingleFlightStats:
+        with self.__lock:
+            return {"executed": self.__executed, "shared": self.__shared, "in_flight": len(self.__calls)}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight. The call runs in its own task, so
+    a waiter being cancelled does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.__calls = {}
+        self.__executed = 0
+        self.__shared = 0
+
+    def __forget(self, key, task):
+        if self.__calls.get(key) is task:
+            del self.__calls[key]
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable]):
+        task = self.__calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self.__calls[key] = task
+            task.add_done_callback(lambda done: self.__forget(key, done))
+            self.__executed += 1
+        else:
+            self.__shared += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> SingleFlightStats:
+        return {"executed": self.__executed, "shared": self.__shared, "in_flight": len(self.__calls)}
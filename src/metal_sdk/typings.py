@@ -1,8 +1,12 @@
 from __future__ import annotations
 from enum import Enum
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Union
 from typing_extensions import TypedDict, NotRequired
 
+if TYPE_CHECKING:
+    from .pool import PoolConfig
+    from .ratelimit import RateLimiter
+
 
 class TuneLabel(Enum):
     NEGATIVE = -1
@@ -15,12 +19,16 @@ class IndexStatus(Enum):
     UNARCHIVED = "UNARCHIVED"
 
 
+# Lists, NumPy arrays, array.array('f') and float memoryviews are all accepted
+Embedding = Union[List[float], Sequence[float], memoryview]
+
+
 class IndexPayload(TypedDict):
     id: NotRequired[str]
     imageBase64: NotRequired[str]
     imageUrl: NotRequired[str]
     text: NotRequired[str]
-    embedding: NotRequired[List[float]]
+    embedding: NotRequired[Embedding]
     metadata: NotRequired[dict]
 
 
@@ -30,7 +38,7 @@ class BulkIndexItem(TypedDict):
     imageBase64: NotRequired[str]
     imageUrl: NotRequired[str]
     text: NotRequired[str]
-    embedding: NotRequired[List[float]]
+    embedding: NotRequired[Embedding]
     metadata: NotRequired[dict]
 
 
@@ -38,6 +46,127 @@ class BulkIndexPayload(TypedDict):
     data: List[BulkIndexItem]
 
 
+class BulkBatchResult(TypedDict):
+    batch: int
+    count: int
+    skipped: NotRequired[int]
+    response: NotRequired[dict]
+    error: NotRequired[str]
+
+
+class BulkIndexReport(TypedDict):
+    batches: int
+    indexed: int
+    failed: int
+    skipped: int
+    results: List[BulkBatchResult]
+
+
+class BulkDeleteFailure(TypedDict):
+    ids: List[str]
+    error: str
+
+
+class BulkDeleteReport(TypedDict):
+    batches: int
+    deleted: List[str]
+    failed: List[str]
+    failures: List[BulkDeleteFailure]
+
+
+class SearchManyResult(TypedDict):
+    query: int
+    latency: float
+    response: NotRequired[dict]
+    error: NotRequired[str]
+
+
+class FederatedSearchResult(TypedDict):
+    data: List[dict]
+    failed: Dict[str, str]
+
+
+class CacheStats(TypedDict):
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    size: int
+
+
+class SingleFlightStats(TypedDict):
+    executed: int
+    shared: int
+    in_flight: int
+
+
+class HedgeStats(TypedDict):
+    requests: int
+    hedged: int
+    wins: int
+    hedge_rate: float
+    win_rate: float
+
+
+class CircuitStats(TypedDict):
+    state: str
+    calls: int
+    failure_rate: float
+    slow_rate: float
+    rejected: int
+
+
+class ConcurrencyStats(TypedDict):
+    limit: int
+    in_flight: int
+    waiting: int
+    increases: int
+    decreases: int
+
+
+class RetryStats(TypedDict):
+    requests: int
+    retries: int
+    budget_exhausted: int
+    budget: float
+
+
+class PoolStats(TypedDict):
+    requests: int
+    in_flight: int
+    peak_in_flight: int
+    connections: int
+    idle_connections: int
+    max_connections: Optional[int]
+    utilization: float
+
+
+class CheckpointFailure(TypedDict):
+    offset: int
+    count: int
+    error: str
+
+
+class CheckpointState(TypedDict):
+    offset: int
+    batches: int
+    failed: int
+    failures: List[CheckpointFailure]
+
+
+class OutboxRecord(TypedDict):
+    seq: int
+    method: str
+    url: str
+    data: dict
+
+
+class OutboxReplayReport(TypedDict):
+    replayed: int
+    rejected: int
+    pending: int
+
+
 class SearchClause(TypedDict):
     field: str
     value: str | int | float
@@ -51,7 +180,7 @@ class SearchPayload(TypedDict):
     imageBase64: NotRequired[str]
     imageUrl: NotRequired[str]
     text: NotRequired[str]
-    embedding: NotRequired[List[float]]
+    embedding: NotRequired[Embedding]
     filters: NotRequired[SearchFilter]
 
 
@@ -65,6 +194,9 @@ class MotorheadPayload(TypedDict):
     api_key: NotRequired[str]
     client_id: NotRequired[str]
     base_url: NotRequired[str]
+    json_codec: NotRequired[str]
+    pool: NotRequired[PoolConfig]
+    rate_limiter: NotRequired[RateLimiter]
 
 
 class MetadataField(TypedDict):
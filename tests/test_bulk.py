@@ -0,0 +1,72 @@
+import json
+from unittest import TestCase
+from src.metal_sdk.bulk import (
+    batch_result,
+    batched,
+    chunked,
+    estimate_size,
+    finish,
+    id_chunks,
+    new_delete_report,
+    new_report,
+    record,
+    record_delete,
+)
+
+
+class TestBulk(TestCase):
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+    def test_chunked_invalid_size(self):
+        with self.assertRaises(ValueError) as ctx:
+            list(chunked([1], 0))
+        self.assertEqual(str(ctx.exception), "batch_size must be at least 1")
+
+    def test_id_chunks(self):
+        self.assertEqual(list(id_chunks(["a", "b", "c"], size=2)), [["a", "b"], ["c"]])
+        self.assertEqual(list(id_chunks(["aaa", "bbb", "c"], max_length=7)), [["aaa", "bbb"], ["c"]])
+        self.assertEqual(list(id_chunks(["aaaaaaaa", "b"], max_length=4)), [["aaaaaaaa"], ["b"]])
+        self.assertEqual(list(id_chunks([])), [])
+
+    def test_estimate_size(self):
+        item = {"id": "a", "text": "héllo", "embedding": [0.1, -2.5, 3], "metadata": {"ok": True, "n": None}}
+        self.assertEqual(estimate_size(item), len(json.dumps(item)))
+        self.assertEqual(estimate_size([]), 2)
+
+        escaped = {"text": 'say "hi"\n\tC:\\path\x7f', 'quoted "key"': 1}
+        self.assertEqual(estimate_size(escaped), len(json.dumps(escaped)))
+
+    def test_batched_by_bytes(self):
+        items = [{"text": "x" * 40}, {"text": "y"}, {"text": "z" * 40}, {"text": "big" * 100}]
+        batches = list(batched(items, 10, 80))
+
+        self.assertEqual(batches, [items[:2], [items[2]], [items[3]]])
+        for batch in batches[:2]:
+            self.assertLessEqual(len(json.dumps({"data": batch})), 80)
+
+    def test_batched_by_count(self):
+        batches = list(batched([{"text": "a"}] * 5, 2, 1024))
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_record(self):
+        report = new_report()
+        record(report, batch_result(1, 3, error="boom"))
+        record(report, batch_result(0, 2, response={"data": "ok"}))
+        finish(report)
+
+        self.assertEqual(report["batches"], 2)
+        self.assertEqual(report["indexed"], 2)
+        self.assertEqual(report["failed"], 3)
+        self.assertEqual(report["results"][0], {"batch": 0, "count": 2, "response": {"data": "ok"}})
+
+    def test_record_delete(self):
+        report = new_delete_report()
+        record_delete(report, ["a", "b"])
+        record_delete(report, ["c"], error="boom")
+
+        self.assertEqual(report["batches"], 2)
+        self.assertEqual(report["deleted"], ["a", "b"])
+        self.assertEqual(report["failed"], ["c"])
+        self.assertEqual(report["failures"], [{"ids": ["c"], "error": "boom"}])
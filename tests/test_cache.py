@@ -0,0 +1,104 @@
+import unittest
+from unittest import TestCase
+from src.metal_sdk.cache import SemanticCache, TTLCache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(TestCase):
+    def test_hit_and_miss(self):
+        cache = TTLCache()
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "evictions": 0, "size": 1})
+
+    def test_lru_eviction(self):
+        cache = TTLCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("b"), (False, None))
+        self.assertEqual(cache.get("a"), (True, 1))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.now = 9.9
+        self.assertEqual(cache.get("a"), (True, 1))
+        clock.now = 10
+        self.assertEqual(cache.get("a"), (False, None))
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate(self):
+        cache = TTLCache()
+        cache.set(("index-a", 1), 1)
+        cache.set(("index-b", 1), 2)
+        cache.invalidate(lambda key: key[0] == "index-a")
+
+        self.assertEqual(cache.get(("index-a", 1)), (False, None))
+        self.assertEqual(cache.get(("index-b", 1)), (True, 2))
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class TestSemanticCache(TestCase):
+    def test_near_identical_query_hits(self):
+        cache = SemanticCache(threshold=0.99)
+        cache.set("scope", [1.0, 0.0, 0.0], "result")
+
+        self.assertEqual(cache.get("scope", [0.999, 0.01, 0.0]), (True, "result"))
+        self.assertEqual(cache.get("scope", [0.0, 1.0, 0.0]), (False, None))
+        self.assertEqual(cache.get("other", [1.0, 0.0, 0.0]), (False, None))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_best_match_wins(self):
+        cache = SemanticCache(threshold=0.9)
+        cache.set("scope", [1.0, 0.1], "close")
+        cache.set("scope", [1.0, 0.0], "exact")
+
+        self.assertEqual(cache.get("scope", [2.0, 0.0]), (True, "exact"))
+
+    def test_eviction_and_memory_cap(self):
+        cache = SemanticCache(maxsize=100, max_bytes=2 * 3 * 4)
+        cache.set("scope", [1.0, 0.0, 0.0], "a")
+        cache.set("scope", [0.0, 1.0, 0.0], "b")
+        cache.set("scope", [0.0, 0.0, 1.0], "c")
+
+        self.assertEqual(cache.nbytes, 24)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get("scope", [1.0, 0.0, 0.0]), (False, None))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_and_invalidate(self):
+        clock = FakeClock()
+        cache = SemanticCache(ttl=10, clock=clock)
+        cache.set(("index-a", 1), [1.0, 0.0], "a")
+        cache.set(("index-b", 1), [1.0, 0.0], "b")
+
+        cache.invalidate(lambda scope: scope[0] == "index-a")
+        self.assertEqual(cache.get(("index-a", 1), [1.0, 0.0]), (False, None))
+        clock.now = 10
+        self.assertEqual(cache.get(("index-b", 1), [1.0, 0.0]), (False, None))
+
+    def test_dimension_mismatch_is_a_miss(self):
+        cache = SemanticCache()
+        cache.set("scope", [1.0, 0.0], "a")
+
+        self.assertEqual(cache.get("scope", [1.0, 0.0, 0.0]), (False, None))
@@ -0,0 +1,53 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from src.metal_sdk.bulk import batch_result
+from src.metal_sdk.checkpoint import Checkpoint
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "checkpoint.json")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_offset_waits_for_earlier_batches(self):
+        checkpoint = Checkpoint(self.path, interval=0)
+        checkpoint.complete(2, batch_result(1, 2, response={}))
+        self.assertEqual(checkpoint.offset, 0)
+
+        checkpoint.complete(0, batch_result(0, 2, response={}))
+        self.assertEqual(checkpoint.offset, 4)
+        self.assertEqual(checkpoint.state["batches"], 2)
+
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["offset"], 4)
+
+    def test_offset_stops_at_failed_batch(self):
+        checkpoint = Checkpoint(self.path, interval=0)
+        checkpoint.complete(0, batch_result(0, 2, response={}))
+        checkpoint.complete(4, batch_result(2, 2, response={}))
+        checkpoint.complete(2, batch_result(1, 2, error="boom"))
+        checkpoint.complete(6, batch_result(3, 2, error="down"))
+
+        self.assertEqual(checkpoint.offset, 2)
+        self.assertEqual(checkpoint.state["batches"], 1)
+        self.assertEqual(checkpoint.state["failed"], 4)
+        self.assertEqual(
+            checkpoint.state["failures"],
+            [{"offset": 2, "count": 2, "error": "boom"}, {"offset": 6, "count": 2, "error": "down"}],
+        )
+
+        resumed = Checkpoint(self.path)
+        self.assertEqual(resumed.offset, 2)
+        self.assertEqual(resumed.state["failures"], [])
+
+    def test_resume_from_file(self):
+        checkpoint = Checkpoint(self.path)
+        checkpoint.complete(0, batch_result(0, 3, response={}))
+        checkpoint.save()
+
+        self.assertEqual(Checkpoint(self.path).offset, 3)
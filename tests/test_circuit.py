@@ -0,0 +1,75 @@
+from unittest import TestCase
+from src.metal_sdk.circuit import CircuitBreaker, CircuitOpenError
+
+
+class TestCircuitBreaker(TestCase):
+    def setUp(self):
+        self.now = [0.0]
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5, window=4, min_calls=4, open_duration=10, half_open_calls=2, clock=lambda: self.now[0]
+        )
+
+    def call(self, failed=False, latency=0.1, endpoint="search"):
+        self.breaker.check(endpoint)
+        self.breaker.record(endpoint, latency, failed)
+
+    def test_opens_on_failure_rate(self):
+        for failed in (False, True, False):
+            self.call(failed)
+        self.assertEqual(self.breaker.state("search"), "closed")
+
+        self.call(True)
+        self.assertEqual(self.breaker.state("search"), "open")
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.check("search")
+        self.assertEqual(ctx.exception.endpoint, "search")
+        self.assertEqual(ctx.exception.retry_in, 10)
+
+        # Other endpoints have their own circuit
+        self.call(endpoint="index")
+        self.assertEqual(self.breaker.stats()["search"]["rejected"], 1)
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker(slow_call_duration=1.0, slow_rate=0.5, window=2, min_calls=2)
+        breaker.check("search")
+        breaker.record("search", 0.1, False)
+        breaker.check("search")
+        breaker.record("search", 2.0, False)
+        self.assertEqual(breaker.state("search"), "open")
+
+    def test_half_open_recovery(self):
+        for _ in range(4):
+            self.call(True)
+        self.now[0] = 10.0
+
+        self.breaker.check("search")
+        self.breaker.check("search")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check("search")
+        self.assertEqual(self.breaker.state("search"), "half_open")
+
+        self.breaker.record("search", 0.1, False)
+        self.breaker.record("search", 0.1, False)
+        self.assertEqual(self.breaker.state("search"), "closed")
+
+    def test_half_open_failure_reopens(self):
+        for _ in range(4):
+            self.call(True)
+        self.now[0] = 10.0
+
+        self.call(True)
+        self.assertEqual(self.breaker.state("search"), "open")
+        self.now[0] = 15.0
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.check("search")
+
+    def test_cancel_frees_trial(self):
+        for _ in range(4):
+            self.call(True)
+        self.now[0] = 10.0
+
+        self.breaker.check("search")
+        self.breaker.check("search")
+        self.breaker.cancel("search")
+        self.breaker.check("search")
+        self.assertEqual(self.breaker.state("search"), "half_open")
@@ -0,0 +1,68 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase, mock
+from src.metal_sdk.coalesce import AsyncIndexCoalescer, IndexCoalescer, split_response
+
+
+class TestSplitResponse(TestCase):
+    def test_split_per_item(self):
+        res = {"status": "ok", "data": [{"id": "a"}, {"id": "b"}]}
+        self.assertEqual(
+            split_response(res, 2),
+            [{"status": "ok", "data": {"id": "a"}}, {"status": "ok", "data": {"id": "b"}}],
+        )
+
+    def test_shared_response(self):
+        self.assertEqual(split_response({"status": "ok"}, 2), [{"status": "ok"}, {"status": "ok"}])
+
+
+class TestIndexCoalescer(TestCase):
+    def test_flush_on_max_batch(self):
+        send = mock.MagicMock(return_value={"data": [1, 2, 3]})
+        coalescer = IndexCoalescer(send, max_batch=3, window=60)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = list(executor.map(coalescer.submit, ["a", "b", "c"]))
+
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(sorted(send.call_args[0][0]), ["a", "b", "c"])
+        self.assertEqual(sorted(future.result(timeout=1)["data"] for future in futures), [1, 2, 3])
+
+    def test_flush_on_window(self):
+        send = mock.MagicMock(return_value={"status": "ok"})
+        coalescer = IndexCoalescer(send, max_batch=100, window=0.01)
+
+        future = coalescer.submit("a")
+
+        self.assertEqual(future.result(timeout=1), {"status": "ok"})
+        self.assertEqual(send.call_args[0][0], ["a"])
+
+    def test_error_reaches_every_caller(self):
+        coalescer = IndexCoalescer(mock.MagicMock(side_effect=ValueError("boom")), max_batch=2, window=60)
+
+        first = coalescer.submit("a")
+        second = coalescer.submit("b")
+
+        self.assertIsInstance(first.exception(timeout=1), ValueError)
+        self.assertIsInstance(second.exception(timeout=1), ValueError)
+
+
+class TestAsyncIndexCoalescer(IsolatedAsyncioTestCase):
+    async def test_flush_on_max_batch(self):
+        send = mock.AsyncMock(return_value={"data": [1, 2]})
+        coalescer = AsyncIndexCoalescer(send, max_batch=2, window=60)
+
+        results = await asyncio.gather(coalescer.submit("a"), coalescer.submit("b"))
+
+        self.assertEqual(send.call_count, 1)
+        self.assertEqual(send.call_args[0][0], ["a", "b"])
+        self.assertEqual([result["data"] for result in results], [1, 2])
+
+    async def test_flush_on_window(self):
+        send = mock.AsyncMock(return_value={"status": "ok"})
+        coalescer = AsyncIndexCoalescer(send, max_batch=100, window=0.01)
+
+        result = await coalescer.submit("a")
+
+        self.assertEqual(result, {"status": "ok"})
+        self.assertEqual(send.call_args[0][0], ["a"])
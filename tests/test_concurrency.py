@@ -0,0 +1,112 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from src.metal_sdk.concurrency import AdaptiveLimiter
+
+
+class TestAdaptiveLimiter(IsolatedAsyncioTestCase):
+    async def test_additive_increase(self):
+        now = [0.0]
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=3, clock=lambda: now[0])
+
+        async def saturate():
+            for start in [await limiter.acquire() for _ in range(limiter.limit)]:
+                limiter.release(start)
+
+        # Only the release that finds every slot taken grows the limit: 2 -> 2.5 -> 2.9 -> 3
+        for _ in range(2):
+            await saturate()
+        self.assertEqual(limiter.limit, 2)
+        await saturate()
+        self.assertEqual(limiter.limit, 3)
+
+        for _ in range(10):
+            await saturate()
+        self.assertEqual(limiter.limit, 3)
+
+    async def test_no_increase_below_limit(self):
+        limiter = AdaptiveLimiter(initial_limit=4, clock=lambda: 0.0)
+        for _ in range(100):
+            limiter.release(await limiter.acquire())
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.stats()["increases"], 0)
+
+    async def test_bound(self):
+        limiter = AdaptiveLimiter(initial_limit=8, max_limit=64, clock=lambda: 0.0)
+        for _ in range(50):
+            for start in [await limiter.acquire() for _ in range(2)]:
+                limiter.release(start, bound=2)
+        self.assertEqual(limiter.limit, 2)
+
+        started = [await limiter.acquire() for _ in range(2)]
+        limiter.release(started[0], overloaded=True, bound=2)
+        self.assertEqual(limiter.limit, 1)
+        limiter.release(started[1], bound=2)
+
+    async def test_multiplicative_decrease_once_per_burst(self):
+        now = [0.0]
+        limiter = AdaptiveLimiter(initial_limit=8, clock=lambda: now[0])
+        started = [await limiter.acquire() for _ in range(4)]
+
+        now[0] = 1.0
+        for start in started:
+            limiter.release(start, overloaded=True)
+        self.assertEqual(limiter.limit, 4)
+
+        limiter.release(await limiter.acquire(), overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.stats()["decreases"], 2)
+
+    async def test_latency_spike(self):
+        now = [0.0]
+        limiter = AdaptiveLimiter(initial_limit=8, clock=lambda: now[0])
+        started = await limiter.acquire()
+        now[0] += 0.1
+        limiter.release(started)
+
+        started = await limiter.acquire()
+        now[0] += 0.5
+        limiter.release(started)
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_latency_per_endpoint(self):
+        now = [0.0]
+        limiter = AdaptiveLimiter(initial_limit=8, clock=lambda: now[0])
+        started = await limiter.acquire()
+        now[0] += 0.1
+        limiter.release(started, endpoint="index")
+
+        # A slow endpoint is only compared with its own latency
+        started = await limiter.acquire()
+        now[0] += 5.0
+        limiter.release(started, endpoint="files")
+        self.assertEqual(limiter.stats()["decreases"], 0)
+
+        started = await limiter.acquire()
+        now[0] += 0.5
+        limiter.release(started, endpoint="index")
+        self.assertEqual(limiter.stats()["decreases"], 1)
+
+    async def test_waits_for_slot(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        started = await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        self.assertFalse(waiter.done())
+        self.assertEqual(limiter.stats()["waiting"], 1)
+        limiter.release(started)
+        await waiter
+        self.assertEqual(limiter.stats()["in_flight"], 1)
+
+    async def test_cancelled_waiter(self):
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        started = await limiter.acquire()
+        cancelled = asyncio.ensure_future(limiter.acquire())
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        limiter.release(started)
+        await waiter
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(limiter.stats()["in_flight"], 1)
@@ -0,0 +1,132 @@
+import gzip
+import json
+import unittest
+from array import array
+from unittest import TestCase, mock
+from src.metal_sdk import encoding
+from src.metal_sdk.encoding import (
+    Compression,
+    JsonCodec,
+    embedding_to_list,
+    encode_body,
+    encode_request,
+    get_codec,
+    with_embedding_list,
+)
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TestEmbeddingToList(TestCase):
+    def test_list_passes_through(self):
+        embedding = [0.5, 0.25]
+        self.assertIs(embedding_to_list(embedding), embedding)
+
+    def test_array(self):
+        self.assertEqual(embedding_to_list(array("f", [0.5, 0.25])), [0.5, 0.25])
+
+    def test_float32_shortest_repr(self):
+        self.assertEqual(embedding_to_list(array("f", [0.5])), [0.5])
+        self.assertNotEqual(embedding_to_list(array("f", [0.1])), [0.1])
+
+        self.assertEqual(embedding_to_list(array("f", [0.1, 1 / 3]), compact=True), [0.1, 0.33333334])
+        self.assertEqual(embedding_to_list(memoryview(array("f", [0.1])), compact=True), [0.1])
+        self.assertEqual(embedding_to_list(array("d", [0.1]), compact=True), [0.1])
+
+        with mock.patch.object(encoding, "numpy", None):
+            self.assertEqual(embedding_to_list(array("f", [0.1, 1 / 3, 1e-8]), compact=True), [0.1, 0.33333334, 1e-8])
+
+    def test_memoryview(self):
+        self.assertEqual(embedding_to_list(memoryview(array("d", [0.5, 0.25]))), [0.5, 0.25])
+
+    def test_memoryview_of_bytes(self):
+        with self.assertRaises(TypeError) as ctx:
+            embedding_to_list(memoryview(b"abcd"))
+        self.assertEqual(str(ctx.exception), "embedding memoryview must hold float32 or float64 values")
+
+    def test_tuple(self):
+        self.assertEqual(embedding_to_list((1, 0.5)), [1.0, 0.5])
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_numpy(self):
+        self.assertEqual(embedding_to_list(numpy.array([0.5, 0.25], dtype=numpy.float32)), [0.5, 0.25])
+        vector = numpy.random.default_rng(0).random(1536, dtype=numpy.float32)
+        converted = embedding_to_list(vector, compact=True)
+        self.assertTrue(numpy.array_equal(numpy.array(converted, dtype=numpy.float32), vector))
+        self.assertLess(len(json.dumps(converted)), len(json.dumps(vector.tolist())) * 0.6)
+
+        with self.assertRaises(TypeError) as ctx:
+            embedding_to_list(numpy.zeros((2, 2)))
+        self.assertEqual(str(ctx.exception), "embedding must be one-dimensional")
+
+    def test_with_embedding_list(self):
+        item = {"id": "a", "embedding": array("f", [0.5])}
+        converted = with_embedding_list(item)
+
+        self.assertEqual(converted, {"id": "a", "embedding": [0.5]})
+        self.assertIsInstance(item["embedding"], array)
+        plain = {"id": "b", "text": "b"}
+        self.assertIs(with_embedding_list(plain), plain)
+
+
+class TestCodecs(TestCase):
+    def test_default_is_httpx_json(self):
+        self.assertIsNone(get_codec(None))
+        self.assertEqual(encode_body(None, {"a": 1}), {"json": {"a": 1}})
+
+    def test_json_codec(self):
+        codec = get_codec("json")
+        self.assertEqual(encode_body(codec, {"a": 1}), {"content": b'{"a": 1}'})
+        self.assertEqual(encode_body(codec, None), {"json": None})
+        self.assertEqual(codec.loads(b'{"a": 1}'), {"a": 1})
+
+    def test_auto_picks_installed_codec(self):
+        codec = get_codec("auto")
+        self.assertIsInstance(codec, JsonCodec)
+        self.assertEqual(codec.loads(codec.dumps({"a": [1.5]})), {"a": [1.5]})
+
+    @unittest.skipUnless(orjson, "orjson not installed")
+    def test_orjson_codec(self):
+        codec = get_codec("orjson")
+        self.assertEqual(codec.dumps({"a": 1}), b'{"a":1}')
+        self.assertEqual(codec.loads(b'{"a":1}'), {"a": 1})
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError) as ctx:
+            get_codec("yaml")
+        self.assertEqual(str(ctx.exception), "Unknown json codec: yaml")
+
+
+class TestCompression(TestCase):
+    def test_below_threshold_is_not_compressed(self):
+        body, compressed = encode_request(None, Compression(threshold=1024), {"a": 1}, {"x-test": "1"})
+
+        self.assertFalse(compressed)
+        self.assertEqual(body, {"content": b'{"a": 1}', "headers": {"x-test": "1"}})
+
+    def test_gzip(self):
+        data = {"data": [{"text": "some text"}] * 100}
+        body, compressed = encode_request(None, Compression(threshold=10, level=1), data)
+
+        self.assertTrue(compressed)
+        self.assertEqual(body["headers"], {"Content-Encoding": "gzip"})
+        self.assertEqual(json.loads(gzip.decompress(body["content"])), data)
+
+    def test_disabled(self):
+        compression = Compression(threshold=0)
+        compression.enabled = False
+
+        self.assertEqual(encode_request(None, compression, {"a": 1}), ({"json": {"a": 1}, "headers": None}, False))
+
+    def test_unsupported_encoding(self):
+        with self.assertRaises(ValueError) as ctx:
+            Compression("br")
+        self.assertEqual(str(ctx.exception), "Unsupported compression: br")
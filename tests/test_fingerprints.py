@@ -0,0 +1,37 @@
+import os
+import tempfile
+from unittest import TestCase
+from src.metal_sdk.fingerprints import FingerprintStore, fingerprint
+
+
+class TestFingerprintStore(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = FingerprintStore(os.path.join(self.dir.name, "fingerprints.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def test_fingerprint_ignores_key_order(self):
+        self.assertEqual(fingerprint({"a": 1, "b": [1.5]}), fingerprint({"b": [1.5], "a": 1}))
+        self.assertNotEqual(fingerprint({"a": 1}), fingerprint({"a": 2}))
+
+    def test_changed(self):
+        digest = fingerprint({"text": "a"})
+        self.store.put([("index", "a", digest)])
+
+        changed = self.store.changed([
+            ("index", "a", fingerprint({"text": "b"})),
+            ("index", "b", digest),
+            ("other", "a", digest),
+        ])
+        self.assertEqual(changed, {("index", "a"), ("index", "b"), ("other", "a")})
+        self.assertEqual(self.store.changed([("index", "a", digest)]), set())
+
+    def test_forget(self):
+        digest = fingerprint({"text": "a"})
+        self.store.put([("index", "a", digest)])
+        self.store.forget("index", ["a"])
+
+        self.assertEqual(self.store.changed([("index", "a", digest)]), {("index", "a")})
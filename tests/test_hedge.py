@@ -0,0 +1,39 @@
+from unittest import TestCase
+from src.metal_sdk.hedge import HedgePolicy
+
+
+class TestHedgePolicy(TestCase):
+    def test_delay_from_percentile(self):
+        policy = HedgePolicy(percentile=0.9, min_samples=10, initial_delay=0.5, min_delay=0.0)
+        self.assertEqual(policy.delay(), 0.5)
+
+        for latency in range(1, 11):
+            policy.observe(latency / 100)
+        self.assertEqual(policy.delay(), 0.09)
+
+    def test_min_delay(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.01)
+        policy.observe(0.001)
+        self.assertEqual(policy.delay(), 0.01)
+
+    def test_budget(self):
+        policy = HedgePolicy(budget=0.2)
+        hedges = 0
+        for _ in range(20):
+            policy.start()
+            hedges += policy.acquire()
+
+        self.assertEqual(hedges, 4)
+        stats = policy.stats()
+        self.assertEqual(stats["requests"], 20)
+        self.assertEqual(stats["hedged"], 4)
+        self.assertEqual(stats["hedge_rate"], 0.2)
+
+    def test_wins(self):
+        policy = HedgePolicy(budget=1.0)
+        policy.start()
+        policy.acquire()
+        policy.observe(0.1, hedge_won=True)
+
+        self.assertEqual(policy.stats()["wins"], 1)
+        self.assertEqual(policy.stats()["win_rate"], 1.0)
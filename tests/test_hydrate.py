@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+from src.metal_sdk.hydrate import AsyncLazyDocuments, LazyDocuments, hit_ids
+
+
+class TestHydrate(TestCase):
+    def test_hit_ids(self):
+        self.assertEqual(hit_ids({"data": [{"id": "a"}, "b"]}), ["a", "b"])
+        self.assertEqual(hit_ids({"message": "error"}), [])
+
+    def test_lazy_documents(self):
+        pages = []
+        prefetched = threading.Event()
+
+        def fetch_page(ids):
+            pages.append(ids)
+            if len(pages) == 2:
+                prefetched.set()
+            return [{"id": id} for id in ids if id != "c"]
+
+        docs = LazyDocuments(["a", "b", "c", "d", "e"], fetch_page, page_size=2)
+        self.assertEqual(len(docs), 5)
+        self.assertEqual(pages, [])
+
+        self.assertEqual(docs[0], {"id": "a"})
+        prefetched.wait(1)
+        self.assertEqual(pages, [["a", "b"], ["c", "d"]])
+
+        self.assertIsNone(docs[2])
+        self.assertEqual(docs[-1], {"id": "e"})
+        self.assertEqual(docs[1:4], [{"id": "b"}, None, {"id": "d"}])
+        self.assertEqual(len(pages), 3)
+        with self.assertRaises(IndexError):
+            docs[5]
+
+    def test_failed_page_is_retried(self):
+        calls = []
+
+        def fetch_page(ids):
+            calls.append(ids)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return [{"id": id} for id in ids]
+
+        docs = LazyDocuments(["a"], fetch_page, prefetch=False)
+        with self.assertRaises(RuntimeError):
+            docs[0]
+        self.assertEqual(docs[0], {"id": "a"})
+
+
+class TestAsyncHydrate(IsolatedAsyncioTestCase):
+    async def test_lazy_documents(self):
+        pages = []
+
+        async def fetch_page(ids):
+            pages.append(ids)
+            await asyncio.sleep(0)
+            return [{"id": id} for id in ids]
+
+        docs = AsyncLazyDocuments(["a", "b", "c"], fetch_page, page_size=2)
+
+        self.assertEqual(await docs.get(1), {"id": "b"})
+        self.assertEqual(pages, [["a", "b"], ["c"]])
+        self.assertEqual([doc async for doc in docs], [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        self.assertEqual(len(pages), 2)
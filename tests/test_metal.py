@@ -1,8 +1,31 @@
 import os
+import gzip
+import json
+from array import array
+import tempfile
+import threading
+import time
 import respx
-from httpx import Response
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from httpx import ConnectError, HTTPStatusError, Request, Response
 from unittest import TestCase, mock
 from src.metal_sdk.metal import Metal
+from src.metal_sdk.cache import SemanticCache, TTLCache
+from src.metal_sdk.checkpoint import Checkpoint
+from src.metal_sdk.circuit import CircuitBreaker, CircuitOpenError
+from src.metal_sdk.encoding import Compression
+from src.metal_sdk.fingerprints import FingerprintStore
+from src.metal_sdk.hedge import HedgePolicy
+from src.metal_sdk.outbox import Outbox
+from src.metal_sdk.pool import PoolConfig
+from src.metal_sdk.ratelimit import RateLimiter, TokenBucket
+from src.metal_sdk.retry import RetryPolicy
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 API_KEY = "api-key"
@@ -29,6 +52,61 @@ class TestMetal(TestCase):
         response = metal.request(method, "/foo/bar")
         assert response.status_code == 200
 
+    @respx.mock
+    def test_request_pool_stats(self):
+        respx.get("https://api.getmetal.io/foo/bar").mock(return_value=Response(200))
+
+        metal = Metal(API_KEY, CLIENT_ID, pool=PoolConfig(max_connections=8, pool_timeout=1.0))
+        metal.request("GET", "/foo/bar")
+        metal.request("GET", "/foo/bar")
+
+        self.assertEqual(metal.timeout.pool, 1.0)
+        self.assertEqual(metal.timeout.read, 30.0)
+        stats = metal.pool_stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+        self.assertEqual(stats["max_connections"], 8)
+
+    @respx.mock
+    def test_request_rate_limited(self):
+        respx.post("https://api.getmetal.io/v1/search").mock(return_value=Response(200, json={"data": []}))
+        respx.get("https://api.getmetal.io/v1/apps").mock(return_value=Response(200, json={"data": []}))
+
+        limiter = RateLimiter({"search": TokenBucket(rate=20, burst=1)})
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", rate_limiter=limiter)
+
+        started = time.monotonic()
+        metal.get_apps()
+        metal.get_apps()
+        self.assertLess(time.monotonic() - started, 0.05)
+
+        started = time.monotonic()
+        for _ in range(3):
+            metal.search({"text": "sabbath"})
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    @respx.mock
+    def test_request_circuit_breaker(self):
+        route = respx.get("https://api.getmetal.io/v1/indexes/index-id/documents/ozzy")
+        route.mock(return_value=Response(503, json={"message": "unavailable"}))
+        respx.post("https://api.getmetal.io/v1/search").mock(return_value=Response(200, json={"data": []}))
+        respx.post("https://api.getmetal.io/v1/index").mock(return_value=Response(200, json={}))
+
+        breaker = CircuitBreaker(window=2, min_calls=2)
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", circuit_breaker=breaker)
+
+        metal.get_one("ozzy")
+        metal.get_one("ozzy")
+        with self.assertRaises(CircuitOpenError):
+            metal.get_one("ozzy")
+        self.assertEqual(route.call_count, 2)
+        self.assertEqual(breaker.state("default"), "open")
+
+        # Failing document reads leave searches and writes alone
+        self.assertEqual(metal.search({"text": "sabbath"}), {"data": []})
+        self.assertEqual(metal.index({"text": "paranoid"}), {})
+        self.assertEqual(breaker.state("index"), "closed")
+
     def test_metal_index_without_index(self):
         metal = Metal(API_KEY, CLIENT_ID)
         with self.assertRaises(TypeError) as ctx:
@@ -65,6 +143,60 @@ class TestMetal(TestCase):
             metal.request.call_args[1]["json"]["metadata"], payload["metadata"]
         )
 
+    def test_metal_index_with_embedding_buffers(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+
+        metal.index({"id": "a", "embedding": array("f", [0.5, 0.25])})
+        self.assertEqual(metal.request.call_args[1]["json"]["embedding"], [0.5, 0.25])
+
+        metal.index_many([{"id": "b", "embedding": memoryview(array("d", [1.5]))}])
+        self.assertEqual(metal.request.call_args[1]["json"]["data"][0]["embedding"], [1.5])
+
+        metal.search({"embedding": array("f", [0.5])})
+        self.assertEqual(metal.request.call_args[1]["json"]["embedding"], [0.5])
+
+    def test_metal_index_with_compact_embeddings(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, compact_embeddings=True)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+
+        metal.index({"id": "a", "embedding": array("f", [0.1])})
+        self.assertEqual(metal.request.call_args[1]["json"]["embedding"], [0.1])
+
+        metal.index_many([{"id": "b", "embedding": array("f", [0.1])}])
+        self.assertEqual(metal.request.call_args[1]["json"]["data"][0]["embedding"], [0.1])
+
+    def test_metal_index_with_json_codec(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, json_codec="json")
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(content=b'{"data": {"id": "a"}}'))
+
+        res = metal.index({"id": "a", "text": "a"})
+
+        self.assertEqual(res, {"data": {"id": "a"}})
+        self.assertNotIn("json", metal.request.call_args[1])
+        self.assertEqual(
+            json.loads(metal.request.call_args[1]["content"]), {"index": my_index, "id": "a", "text": "a"}
+        )
+
+    def test_metal_index_coalesced(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, coalesce_window=60, coalesce_max_batch=2)
+        return_value = mock.MagicMock(json=lambda: {"data": [{"id": "a"}, {"id": "b"}]})
+        metal.request = mock.MagicMock(return_value=return_value)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(metal.index, [{"id": "a", "text": "a"}, {"id": "b", "text": "b"}]))
+
+        self.assertEqual(metal.request.call_count, 1)
+        self.assertEqual(metal.request.call_args[0][1], "/v1/index/bulk")
+        sent = metal.request.call_args[1]["json"]["data"]
+        self.assertEqual(sorted(item["id"] for item in sent), ["a", "b"])
+        self.assertTrue(all(item["index"] == my_index for item in sent))
+        self.assertEqual(sorted(result["data"]["id"] for result in results), ["a", "b"])
+
     def test_metal_index_many_with_text(self):
         my_index = "my-index"
         mock_text = "some text"
@@ -98,6 +230,212 @@ class TestMetal(TestCase):
         self.assertEqual(metal.request.call_args[0][1], "/v1/index/bulk")
         self.assertEqual(metal.request.call_args[1]["json"]["data"], payload_with_index)
 
+    def test_metal_index_many_leaves_payload_untouched(self):
+        my_index = "my-index"
+        with_index = {"id": "a", "text": "some text", "index": "other-index"}
+        without_index = {"id": "b", "text": "some text"}
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+        metal.index_many(iter([with_index, without_index]))
+
+        sent = metal.request.call_args[1]["json"]["data"]
+        self.assertIs(sent[0], with_index)
+        self.assertEqual(sent[1], {"id": "b", "text": "some text", "index": my_index})
+        self.assertEqual(without_index, {"id": "b", "text": "some text"})
+
+    def test_metal_index_many_consumes_lazily(self):
+        my_index = "my-index"
+        consumed = []
+
+        def rows():
+            for i in range(10):
+                consumed.append(i)
+                yield {"id": str(i), "text": "some text"}
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        sent_before = []
+
+        def request(*args, **kwargs):
+            sent_before.append(len(consumed))
+            return mock.MagicMock(json=lambda: {})
+
+        metal.request = mock.MagicMock(side_effect=request)
+        report = metal.index_many(rows(), batch_size=2, max_workers=1)
+
+        self.assertEqual(report["indexed"], 10)
+        self.assertLess(sent_before[0], 10)
+
+    def test_metal_index_many_resumes_from_checkpoint(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(5)]
+        ok_response = mock.MagicMock(json=lambda: {})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.json")
+            metal = Metal(API_KEY, CLIENT_ID, my_index)
+            metal.request = mock.MagicMock(side_effect=[ok_response, ok_response, RuntimeError("crash")])
+            with self.assertRaises(RuntimeError):
+                metal.index_many(payload, batch_size=2, max_workers=1, checkpoint=Checkpoint(path))
+
+            checkpoint = Checkpoint(path)
+            self.assertEqual(checkpoint.offset, 4)
+
+            metal.request = mock.MagicMock(return_value=ok_response)
+            report = metal.index_many(payload, batch_size=2, max_workers=1, checkpoint=checkpoint)
+
+            self.assertEqual(metal.request.call_count, 1)
+            self.assertEqual([item["id"] for item in metal.request.call_args[1]["json"]["data"]], ["4"])
+            self.assertEqual(report["indexed"], 1)
+            self.assertEqual(Checkpoint(path).offset, 5)
+
+    def test_metal_index_many_resends_failed_batch(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(50)]
+        ok_response = mock.MagicMock(json=lambda: {})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.json")
+            metal = Metal(API_KEY, CLIENT_ID, my_index)
+            responses = [ok_response] * 10
+            responses[3] = ConnectError("connection reset")
+            metal.request = mock.MagicMock(side_effect=responses)
+            report = metal.index_many(payload, batch_size=5, max_workers=1, checkpoint=Checkpoint(path))
+
+            self.assertEqual(report["failed"], 5)
+            self.assertEqual(Checkpoint(path).offset, 15)
+
+            metal.request = mock.MagicMock(return_value=ok_response)
+            report = metal.index_many(payload, batch_size=5, max_workers=1, checkpoint=Checkpoint(path))
+
+            self.assertEqual(report["indexed"], 35)
+            self.assertEqual(metal.request.call_args_list[0][1]["json"]["data"][0]["id"], "15")
+            self.assertEqual(Checkpoint(path).offset, 50)
+
+    def test_metal_index_many_reuses_checkpoint(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(50)]
+        ok_response = mock.MagicMock(json=lambda: {})
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Checkpoint(os.path.join(tmp, "checkpoint.json"))
+            metal = Metal(API_KEY, CLIENT_ID, my_index)
+            responses = [ok_response] * 10
+            responses[3] = ConnectError("connection reset")
+            metal.request = mock.MagicMock(side_effect=responses)
+            metal.index_many(payload, batch_size=5, max_workers=1, checkpoint=checkpoint)
+            self.assertEqual(checkpoint.offset, 15)
+
+            metal.request = mock.MagicMock(return_value=ok_response)
+            report = metal.index_many(payload, batch_size=5, max_workers=1, checkpoint=checkpoint)
+            self.assertEqual(report["indexed"], 35)
+            self.assertEqual(checkpoint.offset, 50)
+            self.assertEqual(checkpoint.state["failures"], [])
+
+            report = metal.index_many(payload, batch_size=5, max_workers=1, checkpoint=checkpoint)
+            self.assertEqual(report["batches"], 0)
+            self.assertEqual(metal.request.call_count, 7)
+
+    def test_metal_index_skips_unchanged_documents(self):
+        my_index = "my-index"
+        with tempfile.TemporaryDirectory() as tmp:
+            fingerprints = FingerprintStore(os.path.join(tmp, "fingerprints.db"))
+            metal = Metal(API_KEY, CLIENT_ID, my_index, fingerprints=fingerprints)
+            metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+
+            metal.index({"id": "a", "text": "a"})
+            res = metal.index({"id": "a", "text": "a"})
+            self.assertEqual(res, {"skipped": True})
+            self.assertEqual(metal.request.call_count, 1)
+
+            payload = [{"id": "a", "text": "a"}, {"id": "b", "text": "b"}, {"text": "no id"}]
+            report = metal.index_many(payload)
+            self.assertEqual(report["skipped"], 1)
+            self.assertEqual(report["indexed"], 2)
+            sent = metal.request.call_args[1]["json"]["data"]
+            self.assertEqual([item.get("id") for item in sent], ["b", None])
+
+            report = metal.index_many(payload[:2])
+            self.assertEqual(report["skipped"], 2)
+            self.assertEqual(metal.request.call_count, 2)
+
+            metal.delete_one("a")
+            metal.index({"id": "a", "text": "a"})
+            self.assertEqual(metal.request.call_args[0][1], "/v1/index")
+            fingerprints.close()
+
+    def test_metal_index_many_in_batches(self):
+        my_index = "my-index"
+        payload = ({"id": str(i), "text": "some text"} for i in range(5))
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        return_value = mock.MagicMock(json=lambda: {"data": "ok"})
+        metal.request = mock.MagicMock(return_value=return_value)
+        report = metal.index_many(payload, batch_size=2, max_workers=2)
+
+        self.assertEqual(metal.request.call_count, 3)
+        sizes = sorted(len(call[1]["json"]["data"]) for call in metal.request.call_args_list)
+        self.assertEqual(sizes, [1, 2, 2])
+        self.assertEqual(report["batches"], 3)
+        self.assertEqual(report["indexed"], 5)
+        self.assertEqual(report["failed"], 0)
+        self.assertEqual([result["batch"] for result in report["results"]], [0, 1, 2])
+        self.assertEqual(report["results"][0]["response"], {"data": "ok"})
+
+    def test_metal_index_many_splits_by_bytes(self):
+        my_index = "my-index"
+        payload = [
+            {"id": "a", "embedding": [0.123456789] * 100},
+            {"id": "b", "text": "short"},
+            {"id": "c", "embedding": [0.123456789] * 100},
+        ]
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+        report = metal.index_many(payload, max_workers=1, max_batch_bytes=2000)
+
+        self.assertEqual(metal.request.call_count, 2)
+        batches = [call[1]["json"]["data"] for call in metal.request.call_args_list]
+        self.assertEqual([[item["id"] for item in batch] for batch in batches], [["a", "b"], ["c"]])
+        self.assertEqual(report["indexed"], 3)
+
+    def test_metal_index_many_compressed(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(50)]
+        metal = Metal(API_KEY, CLIENT_ID, my_index, compression=Compression(threshold=100))
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+
+        metal.index_many(payload)
+
+        kwargs = metal.request.call_args[1]
+        self.assertEqual(kwargs["headers"], {"Content-Encoding": "gzip"})
+        self.assertEqual(len(json.loads(gzip.decompress(kwargs["content"]))["data"]), 50)
+
+    def test_metal_compression_falls_back_when_rejected(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(50)]
+        metal = Metal(API_KEY, CLIENT_ID, my_index, compression=Compression(threshold=100))
+        rejected = Response(415, request=Request("post", "/v1/index/bulk"))
+        metal.request = mock.MagicMock(side_effect=[rejected, mock.MagicMock(json=lambda: {})])
+
+        report = metal.index_many(payload)
+
+        self.assertEqual(report["indexed"], 50)
+        self.assertEqual(metal.request.call_count, 2)
+        self.assertIsNone(metal.request.call_args[1]["headers"])
+        self.assertFalse(metal.compression.enabled)
+
+    def test_metal_index_many_reports_failed_batch(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(4)]
+        error_response = Response(500, json={"message": "boom"}, request=Request("post", "/v1/index/bulk"))
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        ok_response = mock.MagicMock(json=lambda: {"data": "ok"})
+        metal.request = mock.MagicMock(side_effect=[ok_response, error_response])
+        report = metal.index_many(payload, batch_size=2, max_workers=1)
+
+        self.assertEqual(report["indexed"], 2)
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual(report["results"][1]["error"], "boom")
+
     def test_metal_search_without_index(self):
         metal = Metal(API_KEY, CLIENT_ID)
         with self.assertRaises(TypeError) as ctx:
@@ -154,6 +492,189 @@ class TestMetal(TestCase):
             metal.request.call_args[1]["json"]["filters"], payload["filters"]
         )
 
+    def test_metal_search_many(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+
+        def request(method, url, *args, **kwargs):
+            text = kwargs["json"]["text"]
+            if text == "boom":
+                raise ConnectError("connection refused")
+            if text == "500":
+                return Response(500, json={"message": "internal error"}, request=Request(method, url))
+            return mock.MagicMock(json=lambda: {"data": [{"text": text}]})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        queries = [{"text": "a"}, {"text": "boom"}, {"text": "c"}, {"text": "500"}]
+        results = metal.search_many(queries, limit=5, max_workers=2)
+
+        self.assertEqual(metal.request.call_count, 4)
+        self.assertEqual([result["query"] for result in results], [0, 1, 2, 3])
+        self.assertEqual(results[0]["response"], {"data": [{"text": "a"}]})
+        self.assertEqual(results[1]["error"], "connection refused")
+        self.assertEqual(results[2]["response"], {"data": [{"text": "c"}]})
+        self.assertEqual(results[3], {"query": 3, "latency": results[3]["latency"], "error": "internal error"})
+        self.assertTrue(all(result["latency"] >= 0 for result in results))
+        self.assertEqual(metal.request.call_args[0][1], "/v1/search?limit=5")
+
+    def test_metal_search_lazy(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+
+        def request(method, url, *args, **kwargs):
+            if method == "post":
+                body = {"data": [{"id": id} for id in ["a", "b", "c"]]}
+            else:
+                body = [{"id": id, "text": id} for id in url.rsplit("/", 1)[1].split(",")]
+            return mock.MagicMock(json=lambda: body)
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        docs = metal.search_lazy({"text": "sabbath"}, limit=3, page_size=2, prefetch=False)
+
+        self.assertEqual(docs.ids, ["a", "b", "c"])
+        self.assertEqual(metal.request.call_args[0][1], "/v1/search?limit=3&idsOnly=true")
+        self.assertEqual(docs[1], {"id": "b", "text": "b"})
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/a,b")
+        self.assertEqual(metal.request.call_count, 2)
+
+    def test_metal_search_lazy_page_error(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        failures = [1]
+
+        def request(method, url, *args, **kwargs):
+            if method == "post":
+                return mock.MagicMock(json=lambda: {"data": ["a", "b"]})
+            if failures:
+                failures.pop()
+                return Response(500, json={"message": "boom"}, request=Request(method, url))
+            return mock.MagicMock(json=lambda: [{"id": "a"}, {"id": "b"}])
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        docs = metal.search_lazy({"text": "sabbath"}, limit=2, prefetch=False)
+
+        with self.assertRaises(HTTPStatusError):
+            docs[0]
+        self.assertEqual(list(docs), [{"id": "a"}, {"id": "b"}])
+        self.assertEqual(metal.request.call_count, 3)
+
+    def test_metal_search_indexes(self):
+        metal = Metal(API_KEY, CLIENT_ID)
+        release = threading.Event()
+        hits = {
+            "shard-a": [{"id": "a1", "dist": 0.1}, {"id": "a2", "dist": 0.3}],
+            "shard-b": [{"id": "b1", "dist": 0.2}, {"id": "b2"}],
+        }
+
+        def request(method, url, *args, **kwargs):
+            index = kwargs["json"]["index"]
+            if index == "shard-c":
+                return Response(500, json={"message": "shard down"}, request=Request(method, url))
+            if index == "shard-d":
+                release.wait(1)
+            return mock.MagicMock(json=lambda: {"data": hits.get(index, [])})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        res = metal.search_indexes(
+            {"text": "war pigs"}, ["shard-a", "shard-b", "shard-c", "shard-d"], limit=3, index_timeout=0.2
+        )
+        release.set()
+
+        self.assertEqual(
+            res["data"],
+            [
+                {"id": "a1", "dist": 0.1, "index": "shard-a"},
+                {"id": "b1", "dist": 0.2, "index": "shard-b"},
+                {"id": "a2", "dist": 0.3, "index": "shard-a"},
+            ],
+        )
+        self.assertEqual(res["failed"], {"shard-c": "shard down", "shard-d": "timed out after 0.2s"})
+        self.assertEqual(metal.request.call_args[0][1], "/v1/search?limit=3")
+
+    def test_metal_search_indexes_ids_only(self):
+        metal = Metal(API_KEY, CLIENT_ID)
+        hits = {"shard-a": ["a1", "a2"], "shard-b": [{"id": "b1", "score": 0.7}]}
+
+        def request(method, url, *args, **kwargs):
+            return mock.MagicMock(json=lambda: {"data": hits[kwargs["json"]["index"]]})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        res = metal.search_indexes(
+            {"text": "war pigs"}, ["shard-a", "shard-b"], ids_only=True, limit=2, score_key="score", descending=True
+        )
+
+        self.assertEqual(res["data"], [{"id": "b1", "score": 0.7, "index": "shard-b"}, {"id": "a1", "index": "shard-a"}])
+
+    def test_metal_search_cached(self):
+        my_index = "my-index"
+        payload = {"text": "some text", "filters": {"and": [{"field": "a", "value": 1, "operator": "eq"}]}}
+        cache = TTLCache()
+        metal = Metal(API_KEY, CLIENT_ID, my_index, search_cache=cache)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {"data": [{"id": "a"}]}))
+
+        first = metal.search(payload, limit=5)
+        second = metal.search({"filters": payload["filters"], "text": "some text"}, limit=5)
+        metal.search(payload, limit=6)
+
+        self.assertEqual(first, second)
+        self.assertEqual(metal.request.call_count, 2)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+        metal.index({"id": "b", "text": "b"})
+        metal.search(payload, limit=5)
+        self.assertEqual(metal.request.call_count, 4)
+
+    def test_metal_search_cache_skips_errors(self):
+        my_index = "my-index"
+        error_response = Response(500, json={"message": "boom"}, request=Request("post", "/v1/search"))
+        metal = Metal(API_KEY, CLIENT_ID, my_index, search_cache=TTLCache())
+        metal.request = mock.MagicMock(return_value=error_response)
+
+        self.assertEqual(metal.search({"text": "a"}), {"message": "boom"})
+        metal.search({"text": "a"})
+        self.assertEqual(metal.request.call_count, 2)
+
+    def test_metal_index_many_invalidates_after_write(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, search_cache=TTLCache())
+        searches = []
+
+        def request(method, url, *args, **kwargs):
+            if url == "/v1/index/bulk":
+                # A search racing the write caches what the index held before it
+                metal.search({"text": "a"})
+                return mock.MagicMock(json=lambda: {})
+            searches.append(url)
+            return mock.MagicMock(json=lambda: {"data": [{"id": "a"}]})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        metal.index_many([{"id": "b", "text": "b"}])
+        metal.search({"text": "a"})
+        self.assertEqual(len(searches), 2)
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_metal_search_semantic_cache(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, semantic_cache=SemanticCache(threshold=0.99))
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {"data": [{"id": "a"}]}))
+
+        metal.search({"embedding": [1.0, 0.0, 0.0]}, limit=3)
+        res = metal.search({"embedding": [1.0, 0.001, 0.0]}, limit=3)
+        metal.search({"embedding": [1.0, 0.001, 0.0]}, limit=4)
+
+        self.assertEqual(res, {"data": [{"id": "a"}]})
+        self.assertEqual(metal.request.call_count, 2)
+
+        metal.delete_many(["a"])
+        metal.search({"embedding": [1.0, 0.0, 0.0]}, limit=3)
+        self.assertEqual(metal.request.call_count, 4)
+
     def test_metal_tune_without_index(self):
         metal = Metal(API_KEY, CLIENT_ID)
         with self.assertRaises(TypeError) as ctx:
@@ -197,6 +718,89 @@ class TestMetal(TestCase):
         self.assertEqual(metal.request.call_args[0][0], "get")
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/ozzy")
 
+    def test_metal_get_one_single_flight(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, single_flight=True)
+        release = threading.Event()
+
+        def request(*args, **kwargs):
+            release.wait(1)
+            return mock.MagicMock(json=lambda: {"data": {"id": "ozzy"}})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(metal.get_one, "ozzy") for _ in range(3)]
+            while metal.single_flight.stats()["shared"] < 2:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(metal.request.call_count, 1)
+        self.assertEqual(results, [{"data": {"id": "ozzy"}}] * 3)
+
+    def test_metal_get_one_hedged(self):
+        index_id = "index-id"
+        policy = HedgePolicy(budget=1.0, initial_delay=0.02)
+        metal = Metal(API_KEY, CLIENT_ID, index_id, hedging=policy)
+        release = threading.Event()
+        calls = []
+
+        def request(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                # The first request stalls until the test ends
+                release.wait(1)
+                return mock.MagicMock(json=lambda: {"data": "slow"})
+            return mock.MagicMock(json=lambda: {"data": "fast"})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        self.assertEqual(metal.get_one("ozzy"), {"data": "fast"})
+        release.set()
+        metal.close()
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(policy.stats()["hedged"], 1)
+        self.assertEqual(policy.stats()["wins"], 1)
+
+    def test_metal_hedged_reads_do_not_queue(self):
+        index_id = "index-id"
+        policy = HedgePolicy(budget=1.0, initial_delay=0.2)
+        metal = Metal(API_KEY, CLIENT_ID, index_id, hedging=policy, pool=PoolConfig(max_connections=64))
+
+        def request(*args, **kwargs):
+            time.sleep(0.05)
+            return mock.MagicMock(json=lambda: {"data": "ok"})
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        # More concurrent reads than the default executor size must not queue into hedges
+        with ThreadPoolExecutor(max_workers=64) as executor:
+            results = list(executor.map(lambda i: metal.get_one(f"doc-{i}"), range(64)))
+        metal.close()
+
+        self.assertEqual(results, [{"data": "ok"}] * 64)
+        self.assertEqual(metal.request.call_count, 64)
+        self.assertEqual(policy.stats()["hedged"], 0)
+
+    def test_metal_retry(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, retry=RetryPolicy(backoff=0))
+        url = "/v1/indexes/index-id/documents/ozzy"
+        unavailable = Response(503, json={"message": "unavailable"}, request=Request("get", url))
+        ok = Response(200, json={"id": "ozzy"}, request=Request("get", url))
+        metal.request = mock.MagicMock(side_effect=[unavailable, ok])
+
+        self.assertEqual(metal.get_one("ozzy"), {"id": "ozzy"})
+        self.assertEqual(metal.request.call_count, 2)
+
+        # Writes without an idempotency key are not retried
+        metal.request = mock.MagicMock(return_value=Response(503, json={}, request=Request("post", "/v1/index")))
+        metal.index({"text": "paranoid"})
+        self.assertEqual(metal.request.call_count, 1)
+        self.assertEqual(metal.retry.stats()["retries"], 1)
+
     def test_metal_get_many_with_payload(self):
         index_id = "index-id"
         ids = ["ozzy", "mustain"]
@@ -209,6 +813,94 @@ class TestMetal(TestCase):
         self.assertEqual(metal.request.call_args[0][0], "get")
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/ozzy,mustain")
 
+    def test_metal_get_many_chunked(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        ids = [f"doc-{i}" for i in range(250)]
+
+        def request(method, url, *args, **kwargs):
+            chunk = url.rsplit("/", 1)[1].split(",")
+            body = [{"id": id} for id in reversed(chunk)]
+            return mock.MagicMock(json=lambda: body)
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        res = metal.get_many(ids + ids[:10], max_workers=2)
+
+        self.assertEqual(metal.request.call_count, 3)
+        self.assertEqual(res, [{"id": id} for id in ids])
+        sizes = sorted(len(call[0][1].rsplit("/", 1)[1].split(",")) for call in metal.request.call_args_list)
+        self.assertEqual(sizes, [50, 100, 100])
+
+    def test_metal_get_many_single_id(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {"id": "ozzy"}))
+
+        self.assertEqual(metal.get_many(["ozzy"]), [{"id": "ozzy"}])
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/ozzy")
+        with self.assertRaises(TypeError):
+            metal.get_many([])
+
+    def test_metal_document_cache(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, document_cache=TTLCache())
+        docs = {"ozzy": {"id": "ozzy"}, "dio": {"id": "dio"}, "tony": {"id": "tony"}}
+
+        def request(method, url, *args, **kwargs):
+            ids = url.rsplit("/", 1)[1].split(",")
+            body = docs.get(ids[0]) if len(ids) == 1 else [docs[id] for id in ids]
+            return mock.MagicMock(json=lambda: body)
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        self.assertEqual(metal.get_one("ozzy"), {"id": "ozzy"})
+        self.assertEqual(metal.get_one("ozzy"), {"id": "ozzy"})
+        self.assertEqual(metal.request.call_count, 1)
+
+        res = metal.get_many(["dio", "ozzy", "tony"])
+        self.assertEqual(res, [{"id": "dio"}, {"id": "ozzy"}, {"id": "tony"}])
+        self.assertEqual(metal.request.call_count, 2)
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dio,tony")
+
+        metal.get_many(["dio", "tony"])
+        self.assertEqual(metal.request.call_count, 2)
+
+        metal.delete_many(["dio"])
+        metal.delete_one("ozzy")
+        metal.get_many(["dio", "ozzy", "tony"])
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dio,ozzy")
+
+        metal.index({"id": "tony", "text": "paranoid"})
+        metal.get_one("tony")
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/tony")
+        self.assertEqual(metal.request.call_count, 7)
+
+    def test_metal_document_cache_enveloped(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, document_cache=TTLCache())
+
+        def request(method, url, *args, **kwargs):
+            ids = url.rsplit("/", 1)[1].split(",")
+            body = {"data": {"id": ids[0]}} if len(ids) == 1 else {"data": [{"id": id} for id in ids]}
+            return mock.MagicMock(json=lambda: body)
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        self.assertEqual(metal.get_many(["b", "c"]), [{"id": "b"}, {"id": "c"}])
+        self.assertEqual(metal.get_one("b"), {"data": {"id": "b"}})
+        self.assertEqual(metal.get_one("a"), {"data": {"id": "a"}})
+        self.assertEqual(metal.get_one("a"), {"data": {"id": "a"}})
+        self.assertEqual(metal.get_many(["a", "b", "c"]), [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        self.assertEqual(metal.request.call_count, 2)
+
+        # A hit keeps the shape of the response that cached it, whatever was fetched since
+        bare = {"id": "d"}
+        metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: bare))
+        self.assertEqual(metal.get_one("d"), {"id": "d"})
+        self.assertEqual(metal.get_one("a"), {"data": {"id": "a"}})
+        self.assertEqual(metal.get_one("d"), {"id": "d"})
+
     def test_metal_delete_one_with_payload(self):
         index_id = "index-id"
         id = "ozzy"
@@ -236,6 +928,83 @@ class TestMetal(TestCase):
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/bulk")
         self.assertEqual(metal.request.call_args[1]["json"]["ids"], [id])
 
+    def test_metal_delete_many_chunked_with_retry(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        url = "/v1/indexes/index-id/documents/bulk"
+        unavailable = Response(503, json={"message": "unavailable"}, request=Request("delete", url))
+        rejected = Response(400, json={"message": "bad ids"}, request=Request("delete", url))
+        ok = Response(200, json={}, request=Request("delete", url))
+        attempts = {}
+
+        def request(method, url, *args, **kwargs):
+            ids = tuple(kwargs["json"]["ids"])
+            attempts[ids] = attempts.get(ids, 0) + 1
+            if ids == ("c", "d"):
+                return unavailable if attempts[ids] == 1 else ok
+            if ids == ("e",):
+                return rejected
+            return ok
+
+        metal.request = mock.MagicMock(side_effect=request)
+
+        report = metal.delete_many(["a", "b", "c", "d", "e"], batch_size=2, retry_backoff=0)
+
+        self.assertEqual(attempts, {("a", "b"): 1, ("c", "d"): 2, ("e",): 1})
+        self.assertEqual(report["batches"], 3)
+        self.assertEqual(report["deleted"], ["a", "b", "c", "d"])
+        self.assertEqual(report["failed"], ["e"])
+        self.assertEqual(report["failures"], [{"ids": ["e"], "error": "bad ids"}])
+
+    def test_metal_delete_many_with_retry_policy(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, retry=RetryPolicy(backoff=0))
+        url = "/v1/indexes/index-id/documents/bulk"
+        metal.request = mock.MagicMock(
+            return_value=Response(503, json={"message": "unavailable"}, request=Request("delete", url))
+        )
+
+        report = metal.delete_many(["a", "b"], retry_backoff=0)
+
+        # The policy's 3 attempts, not 3 for each of delete_many's own retries
+        self.assertEqual(metal.request.call_count, 3)
+        self.assertEqual(report["failed"], ["a", "b"])
+
+    def test_metal_outbox_acks_sent_writes(self):
+        index_id = "index-id"
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = Outbox(os.path.join(tmp, "outbox.log"), fsync=False)
+            metal = Metal(API_KEY, CLIENT_ID, index_id, outbox=outbox)
+            metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+
+            metal.index({"id": "a", "text": "a"})
+            metal.index_many([{"id": "b", "text": "b"}])
+            metal.delete_many(["c"])
+
+            self.assertEqual(metal.request.call_count, 3)
+            self.assertEqual(outbox.pending(), [])
+            outbox.close()
+
+    def test_metal_outbox_replay(self):
+        index_id = "index-id"
+        unavailable = Response(503, json={"message": "unavailable"}, request=Request("post", "/v1/index"))
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = Outbox(os.path.join(tmp, "outbox.log"), fsync=False)
+            metal = Metal(API_KEY, CLIENT_ID, index_id, outbox=outbox)
+            metal.request = mock.MagicMock(return_value=unavailable)
+
+            metal.index({"id": "a", "text": "a"})
+            self.assertEqual(len(outbox.pending()), 1)
+
+            metal.request = mock.MagicMock(return_value=mock.MagicMock(json=lambda: {}))
+            report = metal.replay_outbox()
+
+            self.assertEqual(report, {"replayed": 1, "rejected": 0, "pending": 0})
+            self.assertEqual(metal.request.call_args[0][1], "/v1/index")
+            self.assertEqual(metal.request.call_args[1]["json"]["text"], "a")
+            self.assertEqual(outbox.pending(), [])
+            outbox.close()
+
     def test_upload_file(self):
         my_index = "my-index"
         # Get the directory containing this file
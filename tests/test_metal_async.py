@@ -1,8 +1,24 @@
 import os
+import gzip
+import json
+import tempfile
+import asyncio
+import time
 import respx
-from httpx import Response
+from httpx import ConnectError, HTTPStatusError, Request, Response
 from unittest import IsolatedAsyncioTestCase, mock
 from src.metal_sdk.metal_async import Metal
+from src.metal_sdk.cache import TTLCache
+from src.metal_sdk.checkpoint import Checkpoint
+from src.metal_sdk.circuit import CircuitBreaker, CircuitOpenError
+from src.metal_sdk.concurrency import AdaptiveLimiter
+from src.metal_sdk.encoding import Compression
+from src.metal_sdk.fingerprints import FingerprintStore
+from src.metal_sdk.hedge import HedgePolicy
+from src.metal_sdk.outbox import Outbox
+from src.metal_sdk.pool import PoolConfig
+from src.metal_sdk.ratelimit import RateLimiter, TokenBucket
+from src.metal_sdk.retry import RetryPolicy
 
 
 API_KEY = "api-key"
@@ -72,6 +88,37 @@ class TestMetal(IsolatedAsyncioTestCase):
         self.assertEqual(metal.request.call_args[1]["json"]["text"], payload["text"])
         self.assertEqual(metal.request.call_args[1]["json"]["metadata"], payload["metadata"])
 
+    async def test_metal_index_with_json_codec(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, json_codec="json")
+        mock_response = mock.Mock()
+        mock_response.content = b'{"data": {"id": "a"}}'
+        metal.request = mock.AsyncMock(return_value=mock_response)
+
+        res = await metal.index({"id": "a", "text": "a"})
+
+        self.assertEqual(res, {"data": {"id": "a"}})
+        self.assertEqual(
+            json.loads(metal.request.call_args[1]["content"]), {"index": my_index, "id": "a", "text": "a"}
+        )
+
+    async def test_metal_index_coalesced(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, coalesce_window=60, coalesce_max_batch=2)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {"data": [{"id": "a"}, {"id": "b"}]}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+
+        results = await asyncio.gather(
+            metal.index({"id": "a", "text": "a"}),
+            metal.index({"id": "b", "text": "b"}),
+        )
+
+        self.assertEqual(metal.request.call_count, 1)
+        self.assertEqual(metal.request.call_args[0][1], "/v1/index/bulk")
+        self.assertEqual([item["id"] for item in metal.request.call_args[1]["json"]["data"]], ["a", "b"])
+        self.assertEqual([result["data"]["id"] for result in results], ["a", "b"])
+
     async def test_metal_index_many_with_text(self):
         my_index = "my-index"
         mock_text = "some text"
@@ -123,6 +170,165 @@ class TestMetal(IsolatedAsyncioTestCase):
         )
         self.assertEqual(metal.request.call_args[1]["json"]["data"], payload_with_index)
 
+    async def test_metal_index_many_with_async_iterator(self):
+        my_index = "my-index"
+        without_index = {"id": "b", "text": "some text"}
+
+        async def rows():
+            yield {"id": "a", "text": "some text", "index": "other-index"}
+            yield without_index
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+        report = await metal.index_many(rows())
+
+        sent = metal.request.call_args[1]["json"]["data"]
+        self.assertEqual([item["index"] for item in sent], ["other-index", my_index])
+        self.assertEqual(without_index, {"id": "b", "text": "some text"})
+        self.assertEqual(report["indexed"], 2)
+
+    async def test_metal_index_many_resumes_from_checkpoint(self):
+        my_index = "my-index"
+
+        async def rows():
+            for i in range(5):
+                yield {"id": str(i), "text": "some text"}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "checkpoint.json")
+            checkpoint = Checkpoint(path)
+            checkpoint.complete(0, {"batch": 0, "count": 3, "response": {}})
+            checkpoint.save()
+
+            metal = Metal(API_KEY, CLIENT_ID, my_index)
+            mock_response = mock.Mock()
+            mock_response.json.return_value = {}
+            metal.request = mock.AsyncMock(return_value=mock_response)
+            await metal.index_many(rows(), checkpoint=Checkpoint(path))
+
+            sent = metal.request.call_args[1]["json"]["data"]
+            self.assertEqual([item["id"] for item in sent], ["3", "4"])
+            self.assertEqual(Checkpoint(path).offset, 5)
+
+    async def test_metal_index_many_skips_unchanged_documents(self):
+        my_index = "my-index"
+        with tempfile.TemporaryDirectory() as tmp:
+            fingerprints = FingerprintStore(os.path.join(tmp, "fingerprints.db"))
+            metal = Metal(API_KEY, CLIENT_ID, my_index, fingerprints=fingerprints)
+            mock_response = mock.Mock()
+            mock_response.json.return_value = {}
+            metal.request = mock.AsyncMock(return_value=mock_response)
+
+            await metal.index_many([{"id": "a", "text": "a"}])
+            report = await metal.index_many([{"id": "a", "text": "a"}, {"id": "b", "text": "b"}])
+
+            self.assertEqual(report["skipped"], 1)
+            self.assertEqual([item["id"] for item in metal.request.call_args[1]["json"]["data"]], ["b"])
+            self.assertEqual(await metal.index({"id": "b", "text": "b"}), {"skipped": True})
+            self.assertEqual(metal.request.call_count, 2)
+            fingerprints.close()
+
+    async def test_metal_index_many_in_batches(self):
+        my_index = "my-index"
+        payload = ({"id": str(i), "text": "some text"} for i in range(5))
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {"data": "ok"}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+        report = await metal.index_many(payload, batch_size=2, max_workers=2)
+
+        self.assertEqual(metal.request.call_count, 3)
+        sizes = sorted(len(call[1]["json"]["data"]) for call in metal.request.call_args_list)
+        self.assertEqual(sizes, [1, 2, 2])
+        self.assertEqual(report["batches"], 3)
+        self.assertEqual(report["indexed"], 5)
+        self.assertEqual([result["batch"] for result in report["results"]], [0, 1, 2])
+
+    async def test_metal_index_many_splits_by_bytes(self):
+        my_index = "my-index"
+        payload = [
+            {"id": "a", "embedding": [0.123456789] * 100},
+            {"id": "b", "text": "short"},
+            {"id": "c", "embedding": [0.123456789] * 100},
+        ]
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+        report = await metal.index_many(payload, max_workers=1, max_batch_bytes=2000)
+
+        self.assertEqual(metal.request.call_count, 2)
+        batches = [call[1]["json"]["data"] for call in metal.request.call_args_list]
+        self.assertEqual([[item["id"] for item in batch] for batch in batches], [["a", "b"], ["c"]])
+        self.assertEqual(report["indexed"], 3)
+
+    async def test_metal_delete_many_compressed(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, compression=Compression(threshold=100))
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+
+        await metal.delete_many([str(i) for i in range(50)])
+
+        kwargs = metal.request.call_args[1]
+        self.assertEqual(kwargs["headers"], {"Content-Encoding": "gzip"})
+        self.assertEqual(len(json.loads(gzip.decompress(kwargs["content"]))["ids"]), 50)
+
+    async def test_metal_delete_many_chunked_with_retry(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        url = "/v1/indexes/my-index/documents/bulk"
+        unavailable = Response(503, json={"message": "unavailable"}, request=Request("delete", url))
+        ok = Response(200, json={}, request=Request("delete", url))
+        calls = []
+
+        async def request(method, url, *args, **kwargs):
+            calls.append(kwargs["json"]["ids"])
+            return unavailable if kwargs["json"]["ids"] == ["c"] else ok
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        report = await metal.delete_many(["a", "b", "c"], batch_size=2, retries=1, retry_backoff=0)
+
+        self.assertEqual(calls, [["a", "b"], ["c"], ["c"]])
+        self.assertEqual(report["deleted"], ["a", "b"])
+        self.assertEqual(report["failed"], ["c"])
+        self.assertEqual(report["failures"], [{"ids": ["c"], "error": "unavailable"}])
+
+    async def test_metal_delete_many_with_retry_policy(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, retry=RetryPolicy(backoff=0))
+        url = "/v1/indexes/my-index/documents/bulk"
+        metal.request = mock.AsyncMock(
+            return_value=Response(503, json={"message": "unavailable"}, request=Request("delete", url))
+        )
+
+        report = await metal.delete_many(["a", "b"], retry_backoff=0)
+
+        # The policy's 3 attempts, not 3 for each of delete_many's own retries
+        self.assertEqual(metal.request.call_count, 3)
+        self.assertEqual(report["failed"], ["a", "b"])
+
+    async def test_metal_index_many_reports_failed_batch(self):
+        my_index = "my-index"
+        payload = [{"id": str(i), "text": "some text"} for i in range(4)]
+        error_response = Response(500, json={"message": "boom"}, request=Request("post", "/v1/index/bulk"))
+
+        metal = Metal(API_KEY, CLIENT_ID, my_index)
+        ok_response = mock.Mock()
+        ok_response.json.return_value = {"data": "ok"}
+        metal.request = mock.AsyncMock(side_effect=[ok_response, error_response])
+        report = await metal.index_many(payload, batch_size=2, max_workers=1)
+
+        self.assertEqual(report["indexed"], 2)
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual(report["results"][1]["error"], "boom")
+
     async def test_metal_search_without_index(self):
         metal = Metal(API_KEY, CLIENT_ID)
         with self.assertRaises(TypeError) as ctx:
@@ -178,6 +384,254 @@ class TestMetal(IsolatedAsyncioTestCase):
         self.assertEqual(metal.request.call_args[1]["json"]["index"], my_index)
         self.assertEqual(metal.request.call_args[1]["json"]["text"], payload["text"])
 
+    async def test_metal_search_many(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        in_flight = []
+
+        async def request(method, url, *args, **kwargs):
+            in_flight.append(1)
+            self.assertLessEqual(len(in_flight), 2)
+            # Later queries finish first, results must still come back in query order
+            await asyncio.sleep(0.02 * (5 - len(kwargs["json"]["text"])))
+            in_flight.pop()
+            if kwargs["json"]["text"] == "boom":
+                raise ConnectError("connection refused")
+            if kwargs["json"]["text"] == "500":
+                return Response(500, json={"message": "internal error"}, request=Request(method, url))
+            mock_response = mock.Mock()
+            mock_response.json.return_value = {"data": [{"text": kwargs["json"]["text"]}]}
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        queries = [{"text": "a"}, {"text": "boom"}, {"text": "cc"}, {"text": "500"}]
+        results = await metal.search_many(queries, max_workers=2)
+
+        self.assertEqual([result["query"] for result in results], [0, 1, 2, 3])
+        self.assertEqual(results[0]["response"], {"data": [{"text": "a"}]})
+        self.assertEqual(results[1]["error"], "connection refused")
+        self.assertEqual(results[2]["response"], {"data": [{"text": "cc"}]})
+        self.assertEqual(results[3]["error"], "internal error")
+        self.assertNotIn("response", results[3])
+        self.assertGreater(results[0]["latency"], results[2]["latency"])
+
+    @respx.mock
+    async def test_request_pool_stats(self):
+        respx.get("https://api.getmetal.io/foo/bar").mock(return_value=Response(200))
+
+        metal = Metal(API_KEY, CLIENT_ID, pool=PoolConfig(max_connections=8, pool_timeout=1.0))
+        await asyncio.gather(metal.request("GET", "/foo/bar"), metal.request("GET", "/foo/bar"))
+
+        self.assertEqual(metal.timeout.pool, 1.0)
+        stats = metal.pool_stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["in_flight"], 0)
+
+    @respx.mock
+    async def test_request_rate_limited(self):
+        respx.post("https://api.getmetal.io/v1/index").mock(return_value=Response(200, json={}))
+
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", rate_limiter=RateLimiter({"index": TokenBucket(rate=20, burst=1)}))
+
+        started = time.monotonic()
+        await asyncio.gather(*[metal.index({"text": "paranoid"}) for _ in range(3)])
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    @respx.mock
+    async def test_request_circuit_breaker(self):
+        route = respx.post("https://api.getmetal.io/v1/search")
+        route.mock(side_effect=ConnectError("connection refused"))
+
+        breaker = CircuitBreaker(window=2, min_calls=2, open_duration=0.05, half_open_calls=1)
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", circuit_breaker=breaker)
+
+        for _ in range(2):
+            with self.assertRaises(ConnectError):
+                await metal.search({"text": "sabbath"})
+        with self.assertRaises(CircuitOpenError):
+            await metal.search({"text": "sabbath"})
+        self.assertEqual(route.call_count, 2)
+
+        await asyncio.sleep(0.05)
+        route.mock(return_value=Response(200, json={"data": []}), side_effect=None)
+        self.assertEqual(await metal.search({"text": "sabbath"}), {"data": []})
+        self.assertEqual(breaker.state("search"), "closed")
+
+    @respx.mock
+    async def test_get_many_adaptive_concurrency(self):
+        in_flight = []
+        peak = []
+
+        async def documents(request):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.005)
+            in_flight.pop()
+            ids = request.url.path.rsplit("/", 1)[1].split(",")
+            if "doc-fail" in ids:
+                return Response(503, json={"message": "unavailable"})
+            return Response(200, json=[{"id": id} for id in ids])
+
+        respx.get(url__regex=r"https://api.getmetal.io/v1/indexes/index-id/documents/.*").mock(side_effect=documents)
+        limiter = AdaptiveLimiter(initial_limit=2, max_limit=8, latency_tolerance=100)
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", adaptive_concurrency=limiter)
+
+        res = await metal.get_many([f"doc-{i}" for i in range(1000)])
+        self.assertEqual(len(res), 1000)
+        self.assertEqual(limiter.limit, 4)
+        self.assertLessEqual(max(peak), 4)
+
+        await metal.get_many(["doc-fail"])
+        self.assertEqual(limiter.stats()["decreases"], 1)
+        self.assertEqual(limiter.limit, 2)
+
+        # Requests outside bulk paths are not limited
+        respx.get("https://api.getmetal.io/v1/apps").mock(return_value=Response(200, json={}))
+        await metal.get_apps()
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    @respx.mock
+    async def test_index_many_adaptive_concurrency_keeps_max_workers(self):
+        in_flight = []
+        peak = []
+
+        async def bulk(request):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.005)
+            in_flight.pop()
+            return Response(200, json={})
+
+        respx.post("https://api.getmetal.io/v1/index/bulk").mock(side_effect=bulk)
+        limiter = AdaptiveLimiter(initial_limit=8, max_limit=64, latency_tolerance=100)
+        metal = Metal(API_KEY, CLIENT_ID, "index-id", adaptive_concurrency=limiter)
+
+        report = await metal.index_many([{"text": str(i)} for i in range(50)], batch_size=5, max_workers=2)
+
+        self.assertEqual(report["indexed"], 50)
+        self.assertLessEqual(max(peak), 2)
+        # The reported limit is the concurrency that was actually allowed
+        self.assertEqual(limiter.limit, 2)
+
+    async def test_metal_search_lazy(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+
+        async def request(method, url, *args, **kwargs):
+            mock_response = mock.Mock()
+            if method == "post":
+                mock_response.json.return_value = {"data": [{"id": id} for id in ["a", "b", "c"]]}
+            else:
+                mock_response.json.return_value = [{"id": id} for id in url.rsplit("/", 1)[1].split(",")]
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        docs = await metal.search_lazy({"text": "sabbath"}, limit=3, page_size=2)
+
+        self.assertEqual(len(docs), 3)
+        self.assertEqual(await docs.get(2), {"id": "c"})
+        urls = [call[0][1] for call in metal.request.call_args_list]
+        self.assertEqual(urls[1:], ["/v1/indexes/index-id/documents/c"])
+        self.assertEqual([doc async for doc in docs], [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+
+    async def test_metal_search_lazy_page_error(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        failures = [1]
+
+        async def request(method, url, *args, **kwargs):
+            mock_response = mock.Mock()
+            if method == "post":
+                mock_response.json.return_value = {"data": ["a", "b"]}
+            elif failures:
+                failures.pop()
+                return Response(500, json={"message": "boom"}, request=Request(method, url))
+            else:
+                mock_response.json.return_value = [{"id": "a"}, {"id": "b"}]
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        docs = await metal.search_lazy({"text": "sabbath"}, limit=2)
+
+        with self.assertRaises(HTTPStatusError):
+            await docs.get(0)
+        self.assertEqual([doc async for doc in docs], [{"id": "a"}, {"id": "b"}])
+        self.assertEqual(metal.request.call_count, 3)
+
+    async def test_metal_search_indexes(self):
+        metal = Metal(API_KEY, CLIENT_ID)
+        hits = {
+            "shard-a": [{"id": "a1", "score": 0.9}, {"id": "a2", "score": 0.5}],
+            "shard-b": [{"id": "b1", "score": 0.7}],
+        }
+
+        async def request(method, url, *args, **kwargs):
+            index = kwargs["json"]["index"]
+            if index == "shard-c":
+                raise ConnectError("connection refused")
+            if index == "shard-d":
+                await asyncio.sleep(1)
+            mock_response = mock.Mock()
+            mock_response.json.return_value = {"data": hits.get(index, [])}
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        res = await metal.search_indexes(
+            {"text": "war pigs"},
+            ["shard-a", "shard-b", "shard-c", "shard-d"],
+            limit=2,
+            index_timeout=0.05,
+            score_key="score",
+            descending=True,
+        )
+
+        self.assertEqual([hit["id"] for hit in res["data"]], ["a1", "b1"])
+        self.assertEqual(res["failed"], {"shard-c": "connection refused", "shard-d": "timed out after 0.05s"})
+
+    async def test_metal_search_cached(self):
+        my_index = "my-index"
+        cache = TTLCache()
+        metal = Metal(API_KEY, CLIENT_ID, my_index, search_cache=cache)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {"data": [{"id": "a"}]}
+        metal.request = mock.AsyncMock(return_value=mock_response)
+
+        await metal.search({"text": "some text"}, ids_only=True)
+        res = await metal.search({"text": "some text"}, ids_only=True)
+        self.assertEqual(res, {"data": [{"id": "a"}]})
+        self.assertEqual(metal.request.call_count, 1)
+
+        await metal.delete_one("a")
+        await metal.search({"text": "some text"}, ids_only=True)
+        self.assertEqual(metal.request.call_count, 3)
+        self.assertEqual(cache.stats()["hit_rate"], 1 / 3)
+
+    async def test_metal_index_many_invalidates_after_write(self):
+        my_index = "my-index"
+        metal = Metal(API_KEY, CLIENT_ID, my_index, search_cache=TTLCache())
+        searches = []
+
+        async def request(method, url, *args, **kwargs):
+            mock_response = mock.Mock()
+            if url == "/v1/index/bulk":
+                # A search racing the write caches what the index held before it
+                await metal.search({"text": "a"})
+                mock_response.json.return_value = {}
+                return mock_response
+            searches.append(url)
+            mock_response.json.return_value = {"data": [{"id": "a"}]}
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        await metal.index_many([{"id": "b", "text": "b"}])
+        await metal.search({"text": "a"})
+        self.assertEqual(len(searches), 2)
+
     async def test_metal_tune_without_index(self):
         metal = Metal(API_KEY, CLIENT_ID)
         with self.assertRaises(TypeError) as ctx:
@@ -225,6 +679,74 @@ class TestMetal(IsolatedAsyncioTestCase):
         self.assertEqual(metal.request.call_args[0][0], "get")
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dave")
 
+    async def test_metal_get_one_single_flight(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, single_flight=True)
+        mock_response = mock.Mock()
+        mock_response.json.return_value = {"data": {"id": "ozzy"}}
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        results = await asyncio.gather(*[metal.get_one("ozzy") for _ in range(5)], metal.get_one("dio"))
+
+        self.assertEqual(metal.request.call_count, 2)
+        self.assertEqual(results[:5], [{"data": {"id": "ozzy"}}] * 5)
+        self.assertEqual(metal.single_flight.stats()["shared"], 4)
+
+    async def test_metal_search_hedged(self):
+        index_id = "index-id"
+        policy = HedgePolicy(budget=1.0, initial_delay=0.02)
+        metal = Metal(API_KEY, CLIENT_ID, index_id, hedging=policy)
+        cancelled = []
+
+        async def request(*args, **kwargs):
+            mock_response = mock.Mock()
+            if metal.request.call_count == 1:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(1)
+                    raise
+            mock_response.json.return_value = {"data": [{"id": "fast"}]}
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        res = await metal.search({"text": "iron man"})
+
+        self.assertEqual(res, {"data": [{"id": "fast"}]})
+        self.assertEqual(metal.request.call_count, 2)
+        await asyncio.sleep(0)
+        self.assertEqual(cancelled, [1])
+        self.assertEqual(policy.stats()["wins"], 1)
+
+        # No hedge is sent when the budget is spent
+        metal.request.reset_mock(side_effect=True)
+        metal.request.side_effect = request
+        policy.budget = 0.0
+        cancelled.clear()
+        await metal.search({"text": "paranoid"})
+        self.assertEqual(metal.request.call_count, 1)
+
+    async def test_metal_search_retry(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, retry=RetryPolicy(backoff=0))
+        url = "/v1/search?limit=1"
+        limited = Response(429, headers={"Retry-After": "0.01"}, json={}, request=Request("post", url))
+        ok = Response(200, json={"data": []}, request=Request("post", url))
+        metal.request = mock.AsyncMock(side_effect=[limited, limited, ok])
+
+        self.assertEqual(await metal.search({"text": "iron man"}), {"data": []})
+        self.assertEqual(metal.request.call_count, 3)
+
+        metal.request = mock.AsyncMock(side_effect=[limited, limited, limited])
+        self.assertEqual(await metal.search({"text": "iron man"}), {})
+        self.assertEqual(metal.request.call_count, 3)
+
     async def test_metal_get_many_with_payload(self):
         index_id = "index-id"
         ids = ["dave", "ozzy"]
@@ -240,6 +762,74 @@ class TestMetal(IsolatedAsyncioTestCase):
         self.assertEqual(metal.request.call_args[0][0], "get")
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dave,ozzy")
 
+    async def test_metal_get_many_chunked(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id)
+        ids = [f"doc-{i}" for i in range(250)]
+        in_flight = []
+
+        async def request(method, url, *args, **kwargs):
+            in_flight.append(1)
+            self.assertLessEqual(len(in_flight), 2)
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            mock_response = mock.Mock()
+            mock_response.json.return_value = [{"id": id} for id in reversed(url.rsplit("/", 1)[1].split(","))]
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        res = await metal.get_many(ids + ids[:10], max_workers=2)
+
+        self.assertEqual(metal.request.call_count, 3)
+        self.assertEqual(res, [{"id": id} for id in ids])
+
+    async def test_metal_document_cache(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, document_cache=TTLCache())
+        docs = {"ozzy": {"id": "ozzy"}, "dio": {"id": "dio"}, "tony": {"id": "tony"}}
+
+        async def request(method, url, *args, **kwargs):
+            ids = url.rsplit("/", 1)[1].split(",")
+            mock_response = mock.Mock()
+            mock_response.json.return_value = docs.get(ids[0]) if len(ids) == 1 else [docs[id] for id in ids]
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        self.assertEqual(await metal.get_one("ozzy"), {"id": "ozzy"})
+        self.assertEqual(await metal.get_one("ozzy"), {"id": "ozzy"})
+        self.assertEqual(metal.request.call_count, 1)
+
+        res = await metal.get_many(["dio", "ozzy", "tony"])
+        self.assertEqual(res, [{"id": "dio"}, {"id": "ozzy"}, {"id": "tony"}])
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dio,tony")
+
+        await metal.index_many([{"id": "dio", "text": "holy diver"}])
+        await metal.get_many(["dio", "tony"])
+        self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/dio")
+        self.assertEqual(metal.request.call_count, 4)
+
+    async def test_metal_document_cache_enveloped(self):
+        index_id = "index-id"
+        metal = Metal(API_KEY, CLIENT_ID, index_id, document_cache=TTLCache())
+
+        async def request(method, url, *args, **kwargs):
+            ids = url.rsplit("/", 1)[1].split(",")
+            mock_response = mock.Mock()
+            mock_response.json.return_value = (
+                {"data": {"id": ids[0]}} if len(ids) == 1 else {"data": [{"id": id} for id in ids]}
+            )
+            return mock_response
+
+        metal.request = mock.AsyncMock(side_effect=request)
+
+        self.assertEqual(await metal.get_one("a"), {"data": {"id": "a"}})
+        self.assertEqual(await metal.get_one("a"), {"data": {"id": "a"}})
+        self.assertEqual(await metal.get_many(["a", "b", "c"]), [{"id": "a"}, {"id": "b"}, {"id": "c"}])
+        self.assertEqual(await metal.get_one("b"), {"data": {"id": "b"}})
+        self.assertEqual(metal.request.call_count, 2)
+
     async def test_metal_delete_one_with_payload(self):
         index_id = "index-id"
         id = "dave"
@@ -273,6 +863,27 @@ class TestMetal(IsolatedAsyncioTestCase):
         self.assertEqual(metal.request.call_args[0][1], "/v1/indexes/index-id/documents/bulk")
         self.assertEqual(metal.request.call_args[1]["json"]["ids"], [id])
 
+    async def test_metal_outbox_replay(self):
+        index_id = "index-id"
+        unavailable = Response(503, json={"message": "unavailable"}, request=Request("post", "/v1/index"))
+        ok_response = mock.Mock()
+        ok_response.json.return_value = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            outbox = Outbox(os.path.join(tmp, "outbox.log"), fsync=False)
+            metal = Metal(API_KEY, CLIENT_ID, index_id, outbox=outbox)
+            metal.request = mock.AsyncMock(side_effect=[unavailable, ok_response, ok_response])
+
+            await metal.index({"id": "a", "text": "a"})
+            await metal.delete_many(["b"])
+            self.assertEqual(len(outbox.pending()), 1)
+
+            report = await metal.replay_outbox()
+
+            self.assertEqual(report, {"replayed": 1, "rejected": 0, "pending": 0})
+            self.assertEqual(metal.request.call_args[0][1], "/v1/index")
+            self.assertEqual(outbox.pending(), [])
+            outbox.close()
+
     async def test_upload_file(self):
         my_index = "my-index"
         mock_file_path = "/path/to/mockfile.csv"
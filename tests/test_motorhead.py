@@ -3,6 +3,8 @@ import respx
 from httpx import Response
 from unittest.mock import MagicMock
 from src.metal_sdk.motorhead import Motorhead
+from src.metal_sdk.pool import PoolConfig
+from src.metal_sdk.ratelimit import RateLimiter, TokenBucket
 
 
 class TestMotorhead(unittest.TestCase):
@@ -23,6 +25,33 @@ class TestMotorhead(unittest.TestCase):
         response = motorhead.request(method, "/test_endpoint")
         assert response.status_code == 200
 
+    @respx.mock
+    def test_request_with_pool(self):
+        respx.get('https://test_base_url/test_endpoint').mock(return_value=Response(200))
+
+        payload = {
+            "api_key": "test_key",
+            "client_id": "test_id",
+            "base_url": "https://test_base_url",
+            "pool": PoolConfig(max_connections=4, pool_timeout=0.5),
+        }
+        motorhead = Motorhead(payload)
+        motorhead.request("GET", "/test_endpoint")
+
+        self.assertEqual(motorhead.timeout.pool, 0.5)
+        self.assertEqual(motorhead.pool_stats()["requests"], 1)
+        self.assertEqual(motorhead.pool_stats()["max_connections"], 4)
+
+    @respx.mock
+    def test_request_rate_limited(self):
+        respx.get('https://test_base_url/test_endpoint').mock(return_value=Response(200))
+        limiter = RateLimiter({"motorhead": TokenBucket(rate=1, burst=1)})
+
+        payload = {"api_key": "k", "client_id": "c", "base_url": "https://test_base_url", "rate_limiter": limiter}
+        Motorhead(payload).request("GET", "/test_endpoint")
+
+        self.assertGreater(limiter.reserve("motorhead"), 0)
+
     def test_add_memory(self):
         motorhead = Motorhead({"api_key": "test_key", "client_id": "test_client"})
         mock_response = MagicMock(spec=Response)
@@ -42,6 +71,16 @@ class TestMotorhead(unittest.TestCase):
         )
         self.assertEqual(motorhead.request.call_args[1]["json"], {'key': 'value'})
 
+    def test_add_memory_with_json_codec(self):
+        motorhead = Motorhead({"api_key": "test_key", "client_id": "test_client", "json_codec": "json"})
+        mock_response = MagicMock(spec=Response)
+        mock_response.content = b'{"data": "mock_memory"}'
+        motorhead.request = MagicMock(return_value=mock_response)
+
+        memory = motorhead.add_memory('test_session', {'key': 'value'})
+        self.assertEqual(memory, 'mock_memory')
+        self.assertEqual(motorhead.request.call_args[1]["content"], b'{"key": "value"}')
+
     def test_get_memory(self):
         motorhead = Motorhead({"api_key": "test_key", "client_id": "test_client"})
         mock_response = MagicMock(spec=Response)
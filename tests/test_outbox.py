@@ -0,0 +1,66 @@
+import os
+import tempfile
+from unittest import TestCase
+from src.metal_sdk.outbox import Outbox
+
+
+class TestOutbox(TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "outbox.log")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_pending_survives_restart(self):
+        outbox = Outbox(self.path, fsync=False)
+        first = outbox.append("post", "/v1/index", {"text": "a"})
+        second = outbox.append("delete", "/v1/indexes/i/documents/bulk", {"ids": ["b"]})
+        outbox.ack(first)
+        outbox.close()
+
+        reopened = Outbox(self.path, fsync=False)
+        pending = reopened.pending()
+        self.assertEqual([entry["seq"] for entry in pending], [second])
+        self.assertEqual(pending[0]["data"], {"ids": ["b"]})
+        self.assertEqual(reopened.append("post", "/v1/index", {"text": "c"}), second + 1)
+        reopened.close()
+
+    def test_ignores_torn_write(self):
+        outbox = Outbox(self.path, fsync=False)
+        outbox.append("post", "/v1/index", {"text": "a"})
+        outbox.close()
+        with open(self.path, "a") as f:
+            f.write('{"seq": 1, "meth')
+
+        reopened = Outbox(self.path, fsync=False)
+        self.assertEqual(len(reopened.pending()), 1)
+        reopened.close()
+
+    def test_torn_write_survives_two_restarts(self):
+        outbox = Outbox(self.path, fsync=False)
+        outbox.append("post", "/v1/index", {"text": "a"})
+        outbox.close()
+        with open(self.path, "a") as f:
+            f.write('{"seq": 1, "method": "po')
+
+        reopened = Outbox(self.path, fsync=False)
+        self.assertEqual(reopened.append("post", "/v1/index", {"text": "b"}), 1)
+        reopened.close()
+
+        again = Outbox(self.path, fsync=False)
+        self.assertEqual([entry["seq"] for entry in again.pending()], [0, 1])
+        self.assertEqual(again.pending()[1]["data"], {"text": "b"})
+        again.close()
+
+    def test_compaction(self):
+        outbox = Outbox(self.path, fsync=False, compact_threshold=2)
+        seqs = [outbox.append("post", "/v1/index", {"text": str(i)}) for i in range(3)]
+        outbox.ack(seqs[0])
+        outbox.ack(seqs[1])
+
+        with open(self.path) as f:
+            lines = f.readlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual([entry["seq"] for entry in outbox.pending()], [seqs[2]])
+        outbox.close()
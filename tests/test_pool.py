@@ -0,0 +1,32 @@
+from unittest import TestCase
+from src.metal_sdk.pool import PoolConfig, PoolMonitor
+
+
+class TestPool(TestCase):
+    def test_client_options(self):
+        options = PoolConfig(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30).client_options(2.0)
+
+        self.assertEqual(options["limits"].max_connections, 10)
+        self.assertEqual(options["limits"].max_keepalive_connections, 5)
+        self.assertEqual(options["limits"].keepalive_expiry, 30)
+        self.assertFalse(options["http2"])
+        self.assertEqual(options["timeout"].read, 2.0)
+        self.assertEqual(options["timeout"].pool, 2.0)
+
+    def test_pool_timeout(self):
+        options = PoolConfig(pool_timeout=0.5).client_options(2.0)
+        self.assertEqual(options["timeout"].connect, 2.0)
+        self.assertEqual(options["timeout"].pool, 0.5)
+
+    def test_monitor(self):
+        monitor = PoolMonitor(max_connections=4)
+        monitor.enter()
+        monitor.enter()
+        monitor.exit()
+
+        stats = monitor.stats()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["in_flight"], 1)
+        self.assertEqual(stats["peak_in_flight"], 2)
+        self.assertEqual(stats["connections"], 0)
+        self.assertEqual(stats["utilization"], 0.25)
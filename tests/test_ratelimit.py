@@ -0,0 +1,50 @@
+import os
+import tempfile
+from unittest import TestCase
+from src.metal_sdk.ratelimit import FileTokenBucket, RateLimiter, TokenBucket, endpoint_class
+
+
+class TestRateLimit(TestCase):
+    def test_endpoint_class(self):
+        self.assertEqual(endpoint_class("/v1/search?limit=5"), "search")
+        self.assertEqual(endpoint_class("/v1/index/bulk"), "index")
+        self.assertEqual(endpoint_class("/v1/index"), "index")
+        self.assertEqual(endpoint_class("/v1/tune"), "index")
+        self.assertEqual(endpoint_class("/v1/indexes/idx/documents/bulk", "delete"), "index")
+        self.assertEqual(endpoint_class("/v1/indexes/idx/documents/a,b"), "default")
+        self.assertEqual(endpoint_class("/v1/indexes/idx"), "default")
+        self.assertEqual(endpoint_class("/v1/indexes/idx/queries"), "default")
+        self.assertEqual(endpoint_class("https://api.getmetal.io/v1/indexes/idx/files"), "files")
+        self.assertEqual(endpoint_class("/v1/datasources/ds"), "files")
+        self.assertEqual(endpoint_class("/v1/apps"), "default")
+
+    def test_token_bucket(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, burst=2, clock=lambda: now[0])
+
+        self.assertEqual([bucket.reserve() for _ in range(4)], [0.0, 0.0, 0.5, 1.0])
+        now[0] = 1.0
+        self.assertEqual(bucket.reserve(), 0.5)
+        now[0] = 10.0
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_file_token_bucket_is_shared(self):
+        now = [100.0]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "quota.json")
+            first = FileTokenBucket(path, rate=1, burst=1, clock=lambda: now[0])
+            second = FileTokenBucket(path, rate=1, burst=1, clock=lambda: now[0])
+
+            self.assertEqual(first.reserve(), 0.0)
+            self.assertEqual(second.reserve(), 1.0)
+            now[0] = 102.0
+            self.assertEqual(first.reserve(), 0.0)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter({"index": TokenBucket(rate=1, burst=1)})
+        self.assertEqual(limiter.reserve("search"), 0.0)
+        self.assertEqual(limiter.reserve("index"), 0.0)
+        self.assertGreater(limiter.reserve("index"), 0.0)
+
+        with self.assertRaises(ValueError):
+            RateLimiter({"uploads": TokenBucket(rate=1)})
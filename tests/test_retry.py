@@ -0,0 +1,69 @@
+from unittest import TestCase
+from httpx import ConnectError, HTTPStatusError, ReadError, Request, Response
+from src.metal_sdk.retry import RetryPolicy, retry_after
+
+
+def status_error(status_code, headers=None, method="GET"):
+    request = Request(method, "https://api.getmetal.io/v1/search")
+    response = Response(status_code, headers=headers, request=request)
+    return HTTPStatusError("error", request=request, response=response)
+
+
+class TestRetryPolicy(TestCase):
+    def test_retry_after(self):
+        self.assertEqual(retry_after(status_error(503, {"Retry-After": "2"}).response), 2.0)
+        self.assertGreater(retry_after(status_error(503, {"Retry-After": "Wed, 21 Oct 2099 07:28:00 GMT"}).response), 0)
+        self.assertIsNone(retry_after(status_error(503, {"Retry-After": "soon"}).response))
+        self.assertIsNone(retry_after(status_error(503).response))
+
+    def test_idempotent(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.idempotent("get"))
+        self.assertTrue(policy.idempotent("delete"))
+        self.assertFalse(policy.idempotent("post"))
+        self.assertTrue(policy.idempotent("post", {"Idempotency-Key": "abc"}))
+
+    def test_backoff_with_full_jitter(self):
+        policy = RetryPolicy(max_attempts=5, backoff=0.1, max_backoff=0.3, jitter=lambda: 1.0)
+        started = policy.start()
+        delays = [policy.next_delay(status_error(503), attempt, started, True) for attempt in range(1, 5)]
+        self.assertEqual(delays, [0.1, 0.2, 0.3, 0.3])
+        self.assertIsNone(policy.next_delay(status_error(503), 5, started, True))
+
+        policy.jitter = lambda: 0.5
+        self.assertEqual(policy.next_delay(status_error(503), 1, started, True), 0.05)
+
+    def test_honours_retry_after(self):
+        policy = RetryPolicy(jitter=lambda: 0.0)
+        started = policy.start()
+        self.assertEqual(policy.next_delay(status_error(429, {"Retry-After": "1.5"}), 1, started, True), 1.5)
+
+    def test_only_retries_transient_errors_of_idempotent_requests(self):
+        policy = RetryPolicy()
+        started = policy.start()
+        self.assertIsNone(policy.next_delay(status_error(400), 1, started, True))
+        self.assertIsNone(policy.next_delay(status_error(503, method="POST"), 1, started, False))
+        self.assertIsNone(policy.next_delay(ReadError("reset"), 1, started, False))
+        self.assertIsNotNone(policy.next_delay(ReadError("reset"), 1, started, True))
+        # A request that never connected was not processed, so it is safe to resend
+        self.assertIsNotNone(policy.next_delay(ConnectError("refused"), 1, started, False))
+
+    def test_deadline(self):
+        now = [0.0]
+        policy = RetryPolicy(deadline=1.0, jitter=lambda: 0.0, clock=lambda: now[0])
+        started = policy.start()
+        self.assertEqual(policy.next_delay(status_error(503), 1, started, True), 0.0)
+        self.assertIsNone(policy.next_delay(status_error(503, {"Retry-After": "2"}), 1, started, True))
+        now[0] = 1.5
+        self.assertIsNone(policy.next_delay(status_error(503), 2, started, True))
+
+    def test_budget(self):
+        policy = RetryPolicy(max_attempts=100, budget_ratio=0.5, budget_reserve=2, jitter=lambda: 0.0)
+        started = policy.start()
+        delays = [policy.next_delay(status_error(503), attempt, started, True) for attempt in range(1, 4)]
+        self.assertEqual(delays, [0.0, 0.0, None])
+
+        policy.start()
+        policy.start()
+        self.assertEqual(policy.next_delay(status_error(503), 1, started, True), 0.0)
+        self.assertEqual(policy.stats(), {"requests": 3, "retries": 3, "budget_exhausted": 1, "budget": 0.0})
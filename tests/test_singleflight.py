@@ -0,0 +1,70 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import IsolatedAsyncioTestCase, TestCase
+from src.metal_sdk.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class TestSingleFlight(TestCase):
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            release.wait(1)
+            return {"data": "ok"}
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(flight.do, "key", call) for _ in range(4)]
+            while flight.stats()["shared"] < 3:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"data": "ok"}] * 4)
+        self.assertEqual(flight.stats(), {"executed": 1, "shared": 3, "in_flight": 0})
+
+    def test_exception_is_shared_and_cleared(self):
+        flight = SingleFlight()
+
+        def call():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", call)
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+
+
+class TestAsyncSingleFlight(IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_result(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"data": "ok"}
+
+        results = await asyncio.gather(*[flight.do("key", call) for _ in range(5)])
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"data": "ok"}] * 5)
+        self.assertEqual(await flight.do("key", call), {"data": "ok"})
+        self.assertEqual(len(calls), 2)
+
+    async def test_cancelled_waiter_does_not_cancel_call(self):
+        flight = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            return 1
+
+        first = asyncio.ensure_future(flight.do("key", call))
+        second = asyncio.ensure_future(flight.do("key", call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 1)